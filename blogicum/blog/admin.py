@@ -1,20 +1,147 @@
 from django.contrib import admin
+from django.db.models import Q
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.http import urlencode
 from django.utils.text import Truncator
 
+from .constants import COMMENT_INLINE_LIMIT
+from .lookups import get_lookups
 from .models import Category, Location, Post, Comment
+from .pagination import CursorPaginator, EstimatedCountPaginator
+from .services import delete_comments
 
 admin.site.empty_value_display = "Не задано"
 
 
+class CommentInlineFormSet(BaseInlineFormSet):
+    """
+    Формы одной страницы комментариев публикации.
+
+    Страницу задаёт курсор `comments_cursor` адреса. Самый новый
+    комментарий страницы передаётся в форме скрытым полем
+    `comments_anchor`, и при отправке формы страница строится от него:
+    комментарии, добавленные после открытия формы, не сдвигают её.
+    """
+
+    per_page = COMMENT_INLINE_LIMIT
+    total = 0
+    anchor = None
+    previous_url = None
+    next_url = None
+    changelist_url = None
+
+    def get_queryset(self):
+        if not hasattr(self, "_page_queryset"):
+            queryset = super().get_queryset()
+            position = (
+                CursorPaginator.decode_cursor(self.anchor)
+                if self.anchor
+                else None
+            )
+            if position is not None:
+                created_at, pk, _ = position
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at)
+                    | Q(created_at=created_at, pk__lte=pk)
+                )
+            self._page_queryset = queryset.order_by(
+                "-created_at", "-pk"
+            )[:self.per_page]
+        return self._page_queryset
+
+
 class CommentInline(admin.StackedInline):
+    """
+    Комментарии на странице публикации: свёрнуты и выводятся страницами
+    по `COMMENT_INLINE_LIMIT`, новые первыми.
+    """
+
     model = Comment
+    formset = CommentInlineFormSet
+    template = "admin/blog/comment_inline.html"
+    classes = ("collapse",)
+    ordering = ("-created_at", "-pk")
     raw_id_fields = ("author",)
     extra = 0
+    cursor_param = "comments_cursor"
+    anchor_param = "comments_anchor"
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        if obj is None:
+            return formset
+        # Счётчик публикации заменяет COUNT(*) по комментариям.
+        formset.total = obj.comment_count
+        paginator = CursorPaginator(
+            obj.comments.all(), formset.per_page, key="created_at"
+        )
+        page = paginator.get_page(request.GET.get(self.cursor_param))
+        formset.anchor = request.POST.get(self.anchor_param)
+        if formset.anchor is None and page.object_list:
+            newest = page.object_list[0]
+            formset.anchor = paginator.encode_cursor(
+                newest.created_at, newest.pk, False
+            )
+
+        def page_url(cursor):
+            query = request.GET.copy()
+            query[self.cursor_param] = cursor
+            return f"?{query.urlencode()}"
+
+        if page.has_previous():
+            formset.previous_url = page_url(page.previous_cursor)
+        if page.has_next():
+            formset.next_url = page_url(page.next_cursor)
+        formset.changelist_url = "{}?{}".format(
+            reverse("admin:blog_comment_changelist"),
+            urlencode({"post__id__exact": obj.pk}),
+        )
+        return formset
+
+
+class CategoryListFilter(admin.SimpleListFilter):
+    """Фильтр по категории, варианты берутся из справочника в памяти."""
+
+    title = "категория"
+    parameter_name = "category"
+
+    def lookups(self, request, model_admin):
+        categories = sorted(
+            get_lookups().categories.values(),
+            key=lambda category: category.title,
+        )
+        return [(category.pk, category.title) for category in categories]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(category_id=self.value())
+        return queryset
 
 
 class CommentAdmin(admin.ModelAdmin):
     list_display = ("short_text", "post", "author", "created_at")
+    list_select_related = ("post", "author")
     raw_id_fields = ("post", "author")
+    date_hierarchy = "created_at"
+    change_list_template = "admin/range_date_change_list.html"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ("delete_selected_comments",)
+
+    def get_actions(self, request):
+        # Стандартное удаление вызывает сигналы для каждого комментария.
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    @admin.action(
+        permissions=("delete",),
+        description="Удалить выбранные комментарии",
+    )
+    def delete_selected_comments(self, request, queryset):
+        deleted = delete_comments(queryset.values_list("pk", flat=True))
+        self.message_user(request, f"Удалено комментариев: {deleted}.")
 
     def short_text(self, comment: Comment):
         return Truncator(comment.text).chars(50)
@@ -29,6 +156,12 @@ class PostAdmin(admin.ModelAdmin):
         "is_published",
         "created_at",
     )
+    list_select_related = ("author", "category")
+    list_filter = ("is_published", CategoryListFilter, "pub_date")
+    date_hierarchy = "pub_date"
+    change_list_template = "admin/range_date_change_list.html"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = (CommentInline,)
     raw_id_fields = ("author", "location", "category")
 
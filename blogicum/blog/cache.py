@@ -0,0 +1,191 @@
+import hashlib
+import time
+from functools import wraps
+from datetime import datetime, timezone as dt_timezone
+from typing import Callable, Iterable, Tuple
+
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, Q, Value, When
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+
+from blog.constants import FEED_CACHE_TIMEOUT
+from blog.models import Post
+
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+FEED_VERSION_KEY = "blog:feed-version:{feed}"
+FEED_PAGE_KEY = "blog:feed-page:{feed}:{versions}:{query}"
+ALL_FEEDS = "*"
+INDEX_FEED = "index"
+POPULAR_FEED = "popular"
+TRENDING_FEED = "trending"
+
+
+def category_feed(category_slug: str) -> str:
+    return f"category:{category_slug}"
+
+
+def profile_feed(username: str) -> str:
+    return f"profile:{username}"
+
+
+def _feed_versions(feed: str) -> str:
+    keys = [
+        FEED_VERSION_KEY.format(feed=ALL_FEEDS),
+        FEED_VERSION_KEY.format(feed=feed),
+    ]
+    versions = cache.get_many(keys)
+    return ".".join(str(versions.get(key, 0)) for key in keys)
+
+
+def feed_state(feed: str) -> Tuple[str, datetime]:
+    """
+    Версии ленты для валидаторов условных запросов.
+
+    Версия — момент последнего сброса ленты (`time.time_ns()`), поэтому
+    она же даёт Last-Modified. Недостающая версия заводится текущим
+    моментом и дальше не меняется до следующего сброса.
+
+    :return: Пара `(версии, время последнего изменения)`.
+    """
+    keys = [
+        FEED_VERSION_KEY.format(feed=ALL_FEEDS),
+        FEED_VERSION_KEY.format(feed=feed),
+    ]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key) or time.time_ns()
+    changed = datetime.fromtimestamp(
+        max(versions.values()) / 1e9, tz=dt_timezone.utc
+    )
+    return ".".join(str(versions[key]) for key in keys), changed
+
+
+def post_feeds(post_ids, only_visible=False):
+    """
+    Возвращает имена лент, в которых показываются публикации.
+
+    :param only_visible: Только ленты, где публикации видны всем. Профиль
+        автора возвращается всегда: владелец видит в нём и скрытые
+        публикации.
+    """
+    visible = Q(
+        is_published=True,
+        pub_date__lte=timezone.now(),
+        category__is_published=True,
+    )
+    rows = (
+        Post.objects.filter(pk__in=post_ids)
+        .annotate(
+            visible=Case(
+                When(visible, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        )
+        .values_list("category__slug", "author__username", "visible")
+    )
+    feeds = set()
+    for category_slug, username, is_visible in rows:
+        feeds.add(profile_feed(username))
+        if only_visible and not is_visible:
+            continue
+        feeds.update({INDEX_FEED, POPULAR_FEED, TRENDING_FEED})
+        if category_slug:
+            feeds.add(category_feed(category_slug))
+    return feeds
+
+
+def invalidate_feeds(feeds: Iterable[str]) -> None:
+    """
+    Сбрасывает закешированные страницы перечисленных лент.
+
+    Страницы не удаляются явно: меняется версия ленты, поэтому старые ключи
+    перестают использоваться и вытесняются по таймауту.
+
+    :param feeds: Имена лент; `ALL_FEEDS` сбрасывает все ленты сразу.
+    """
+    version = time.time_ns()
+    cache.set_many(
+        {FEED_VERSION_KEY.format(feed=feed): version for feed in set(feeds)},
+        timeout=None,
+    )
+
+
+def post_card_version(post) -> str:
+    """
+    Версия фрагмента карточки публикации.
+
+    Строится из всех полей, выводимых в `includes/post_card.html`, поэтому
+    меняется вместе с публикацией, её категорией, местоположением, автором
+    и количеством комментариев и не требует явной инвалидации.
+    """
+    category = post.category
+    location = post.location
+    parts = (
+        post.title,
+        post.excerpt,
+        post.pub_date.isoformat(),
+        post.is_published,
+        post.image.name,
+        post.image_renditions,
+        post.comment_count,
+        post.author.username,
+        category and (category.title, category.slug, category.is_published),
+        location and (location.name, location.is_published),
+    )
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def cache_anonymous_feed(get_feed: Callable[..., str]):
+    """
+    Кеширует ответ представления ленты для анонимных пользователей.
+
+    Ключ кеша строится из имени ленты, её версии и параметров запроса
+    (номер страницы или курсор).
+
+    :param get_feed: Функция, получающая аргументы представления из URL и
+        возвращающая имя ленты.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            if request.method != "GET" or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+
+            # Сдвиг границы видимости сбрасывает ленты с вышедшими
+            # отложенными публикациями до поиска страницы в кеше.
+            from blog.publication import visible_as_of
+
+            visible_as_of()
+            feed = get_feed(*args, **kwargs)
+            query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+            key = FEED_PAGE_KEY.format(
+                feed=feed, versions=_feed_versions(feed), query=query
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                content, headers = cached
+                response = HttpResponse(content)
+                for header, value in headers.items():
+                    response[header] = value
+                patch_vary_headers(response, ("Cookie",))
+                return response
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                headers = {
+                    header: response[header]
+                    for header in CACHED_HEADERS
+                    if response.has_header(header)
+                }
+                cache.set(key, (response.content, headers), FEED_CACHE_TIMEOUT)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,134 @@
+import hashlib
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.utils import timezone
+
+from blog.cache import INDEX_FEED, category_feed, feed_state, profile_feed
+from blog.lookups import get_published_category
+from blog.models import Post
+from blog.publication import visible_as_of
+
+Validator = Optional[Tuple[str, datetime]]
+
+
+def _make_validator(request: HttpRequest, timestamps, *state) -> Validator:
+    """
+    Собирает ETag и Last-Modified из отметок времени и состояния страницы.
+
+    В ETag попадают пользователь и CSRF-cookie: страницы для авторизованных
+    содержат форму и кнопки автора.
+    """
+    timestamps = [timestamp for timestamp in timestamps if timestamp]
+    if not timestamps:
+        return None
+    last_modified = max(timestamps)
+    viewer = (
+        request.user.pk,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        request.GET.urlencode(),
+    )
+    etag = hashlib.md5(
+        repr((last_modified.isoformat(), state, viewer)).encode()
+    ).hexdigest()
+    return etag, last_modified
+
+
+def _cached(request: HttpRequest, key: str, compute) -> Validator:
+    """Считает валидатор один раз на запрос для ETag и Last-Modified."""
+    validators = request.__dict__.setdefault("_blog_validators", {})
+    if key not in validators:
+        validators[key] = compute()
+    return validators[key]
+
+
+def _feed_validator(request: HttpRequest, feed: str) -> Validator:
+    """
+    Валидатор ленты без запросов к базе.
+
+    Ленту сбрасывает `invalidate_feeds()` при каждом изменении, заметном в
+    её карточках: публикаций, комментариев, категорий, местоположений,
+    профилей авторов и при выходе отложенных публикаций. Поэтому версия
+    ленты из `blog.cache` заменяет агрегат по всей ленте, а момент сброса
+    служит Last-Modified. Количество публикаций в ленте (и число страниц)
+    меняется только вместе с версией.
+    """
+    # Сдвиг границы видимости сбрасывает ленты с вышедшими публикациями.
+    visible_as_of()
+    versions, changed = feed_state(feed)
+    return _make_validator(request, [changed], versions)
+
+
+def post_detail_validator(request: HttpRequest, post_id: int) -> Validator:
+    """
+    Валидатор страницы публикации: один запрос, без отрисовки.
+
+    В состояние входит `view_count`: после сброса накопленных просмотров
+    браузер получает страницу с новым счётчиком, а не 304.
+    """
+
+    def compute():
+        row = (
+            Post.objects.filter(pk=post_id)
+            .values_list(
+                "updated_at",
+                "category__updated_at",
+                "location__updated_at",
+                "is_published",
+                "category__is_published",
+                "pub_date",
+                "category_id",
+                "location_id",
+                "view_count",
+            )
+            .first()
+        )
+        if row is None:
+            return None
+        visible = row[3] and row[4] and row[5] <= timezone.now()
+        return _make_validator(request, row[:3], row[3:], visible)
+
+    return _cached(request, "post_detail", compute)
+
+
+def index_validator(request: HttpRequest) -> Validator:
+    return _cached(
+        request, "index", lambda: _feed_validator(request, INDEX_FEED)
+    )
+
+
+def category_validator(request: HttpRequest, category_slug: str) -> Validator:
+    def compute():
+        if get_published_category(category_slug) is None:
+            return None
+        return _feed_validator(request, category_feed(category_slug))
+
+    return _cached(request, "category", compute)
+
+
+def profile_validator(request: HttpRequest, username: str) -> Validator:
+    return _cached(
+        request,
+        "profile",
+        lambda: _feed_validator(request, profile_feed(username)),
+    )
+
+
+def etag(validator):
+    """Адаптер валидатора для `django.views.decorators.http.condition`."""
+
+    def get_etag(request, *args, **kwargs):
+        result = validator(request, *args, **kwargs)
+        return result and result[0]
+
+    return get_etag
+
+
+def last_modified(validator):
+    def get_last_modified(request, *args, **kwargs):
+        result = validator(request, *args, **kwargs)
+        return result and result[1]
+
+    return get_last_modified
@@ -1,2 +1,26 @@
 MAX_NAME_LENGTH = 256
 POSTS_LIMIT = 10
+FEED_CACHE_TIMEOUT = 60 * 5
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+IMAGE_RENDITION_WIDTHS = (320, 640, 1280)
+IMAGE_RENDITIONS_DIR = "renditions"
+PUBLICATION_BOUNDARY_MAX_AGE = 60
+SEARCH_QUERY_MAX_LENGTH = 200
+PAGINATOR_ON_EACH_SIDE = 2
+PAGINATOR_ON_ENDS = 1
+FEED_COUNT_TIMEOUT = 60 * 60
+FEED_COUNT_ESTIMATE_FROM = 100_000
+COMMENTS_LIMIT = 50
+VIEW_BUFFER_SIZE = 100
+VIEW_BUFFER_SECONDS = 5
+VIEW_FLUSH_INTERVAL = 60
+RANKED_FEED_LIMIT = 10
+RANKING_INTERVAL = 60 * 5
+RANKING_BATCH_SIZE = 1000
+RANKING_COMMENT_WEIGHT = 5
+POPULAR_HALF_LIFE = 60 * 60 * 24 * 30
+TRENDING_HALF_LIFE = 60 * 60 * 12
+EXCERPT_WORDS = 10
+EXCERPT_MAX_LENGTH = 512
+COMMENT_INLINE_LIMIT = 20
+LOOKUPS_MAX_AGE = 60
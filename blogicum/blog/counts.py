@@ -0,0 +1,123 @@
+"""
+Закешированное количество публикаций в лентах для пагинатора.
+
+Счётчик ленты считается один раз (`COUNT(*)` или, на больших таблицах
+PostgreSQL, оценка планировщика) и дальше поправляется на ±1, когда
+публикация появляется в ленте или пропадает из неё. Видимость
+определяется так же, как в `get_post_queryset(use_filters=True)`:
+опубликована, категория опубликована, `pub_date` не позже границы
+`visible_as_of()`. Изменение категории сбрасывает все счётчики.
+"""
+import json
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import QuerySet
+
+from blog.cache import INDEX_FEED, category_feed
+from blog.constants import FEED_COUNT_ESTIMATE_FROM, FEED_COUNT_TIMEOUT
+from blog.models import Post
+
+FEED_COUNT_GENERATION_KEY = "blog:feed-count-generation"
+FEED_COUNT_KEY = "blog:feed-count:{generation}:{feed}"
+FEED_COUNT_ESTIMATED_KEY = "blog:feed-count-estimated:{generation}:{feed}"
+
+
+def _keys(feed: str) -> Tuple[str, str]:
+    generation = cache.get(FEED_COUNT_GENERATION_KEY, 0)
+    return (
+        FEED_COUNT_KEY.format(generation=generation, feed=feed),
+        FEED_COUNT_ESTIMATED_KEY.format(generation=generation, feed=feed),
+    )
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """
+    Оценка числа строк по плану запроса PostgreSQL.
+
+    :return: Оценка или None, если СУБД её не даёт.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    try:
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def feed_count(feed: str, queryset: QuerySet) -> Tuple[int, bool]:
+    """
+    Количество публикаций в ленте.
+
+    :param feed: Имя ленты (`INDEX_FEED` или `category_feed(...)`).
+    :param queryset: Публикации ленты, по ним считается промах кеша.
+    :return: Пара `(количество, приблизительное ли оно)`.
+    """
+    key, estimated_key = _keys(feed)
+    cached = cache.get_many([key, estimated_key])
+    if key in cached:
+        return cached[key], cached.get(estimated_key, False)
+
+    estimated = False
+    count = estimate_count(queryset)
+    if count is not None and count >= FEED_COUNT_ESTIMATE_FROM:
+        estimated = True
+        cache.set(estimated_key, True, FEED_COUNT_TIMEOUT)
+    else:
+        count = queryset.count()
+    cache.set(key, count, FEED_COUNT_TIMEOUT)
+    return count, estimated
+
+
+def counted_feeds(post_ids: Iterable[int], boundary: datetime) -> Counter:
+    """
+    Сколько из публикаций `post_ids` видно в каждой ленте со счётчиком
+    на момент `boundary`.
+    """
+    counter = Counter()
+    visible = Post.objects.filter(
+        pk__in=list(post_ids),
+        is_published=True,
+        pub_date__lte=boundary,
+        category__is_published=True,
+    ).values_list("category__slug", flat=True)
+    for category_slug in visible:
+        counter[INDEX_FEED] += 1
+        counter[category_feed(category_slug)] += 1
+    return counter
+
+
+def adjust_feed_counts(deltas: Counter) -> None:
+    """
+    Поправляет закешированные счётчики лент.
+
+    Незакешированные счётчики пропускаются: их посчитает следующий запрос.
+    """
+    for feed, delta in deltas.items():
+        if not delta:
+            continue
+        key, _ = _keys(feed)
+        try:
+            if delta > 0:
+                cache.incr(key, delta)
+            else:
+                cache.decr(key, -delta)
+        except ValueError:
+            pass
+
+
+def reset_feed_counts() -> None:
+    """Сбрасывает счётчики всех лент."""
+    cache.set(FEED_COUNT_GENERATION_KEY, time.time_ns(), timeout=None)
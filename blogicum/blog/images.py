@@ -0,0 +1,134 @@
+import posixpath
+from io import BytesIO
+from typing import List, Tuple
+
+from django.core.files.base import ContentFile
+from django.db.models.fields.files import FieldFile
+from PIL import Image, ImageOps
+
+from blog.constants import IMAGE_RENDITION_WIDTHS, IMAGE_RENDITIONS_DIR
+
+JPEG_QUALITY = 85
+
+
+def rendition_name(name: str, width: int) -> str:
+    """
+    Имя файла уменьшенной копии изображения в хранилище.
+
+    Например, `post_images/photo.jpg` ->
+    `post_images/renditions/640/photo.jpg`.
+    """
+    directory, filename = posixpath.split(name)
+    return posixpath.join(
+        directory, IMAGE_RENDITIONS_DIR, str(width), filename
+    )
+
+
+def _planned(original_width: int) -> List[Tuple[int, int]]:
+    """
+    Копии для оригинала заданной ширины: пары `(ширина из настроек,
+    настоящая ширина)`.
+
+    Копии никогда не увеличиваются, поэтому для узкого оригинала
+    несколько ширин из настроек дали бы одинаковые файлы: остаётся
+    только первая из них.
+    """
+    planned, seen = [], set()
+    for width in IMAGE_RENDITION_WIDTHS:
+        real_width = min(width, original_width)
+        if real_width not in seen:
+            seen.add(real_width)
+            planned.append((width, real_width))
+    return planned
+
+
+def generate_renditions(
+    image: FieldFile, force: bool = False
+) -> List[Tuple[int, int]]:
+    """
+    Создаёт недостающие копии изображения фиксированной ширины.
+
+    Копия шире оригинала не делается: её заменяет копия в исходном
+    размере. EXIF-метаданные в копии не переносятся, ориентация
+    применяется к пикселям.
+
+    :param image: Файл изображения публикации.
+    :param force: Пересоздать уже существующие копии.
+    :return: Все копии изображения — пары `(ширина из настроек, настоящая
+        ширина)`; их сохраняет `blog.services.store_renditions()`.
+    """
+    if not image:
+        return []
+    with image.open("rb") as source:
+        opened = Image.open(source)
+        image_format = opened.format
+        original = ImageOps.exif_transpose(opened)
+    planned = _planned(original.width)
+    missing = [
+        width
+        for width, _ in planned
+        if force or not image.storage.exists(rendition_name(image.name, width))
+    ]
+    if not missing:
+        return planned
+
+    original.info.pop("exif", None)
+    if image_format == "JPEG" and original.mode not in ("RGB", "L"):
+        original = original.convert("RGB")
+
+    for width in missing:
+        rendition = original.copy()
+        rendition.thumbnail((width, width * 10), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        save_kwargs = {"optimize": True}
+        if image_format == "JPEG":
+            save_kwargs.update(quality=JPEG_QUALITY, progressive=True)
+        rendition.save(buffer, format=image_format, **save_kwargs)
+
+        name = rendition_name(image.name, width)
+        if image.storage.exists(name):
+            image.storage.delete(name)
+        image.storage.save(name, ContentFile(buffer.getvalue()))
+    return planned
+
+
+def strip_exif(image: FieldFile) -> bool:
+    """
+    Удаляет EXIF-метаданные (в том числе геолокацию) из оригинала.
+
+    Ориентация из EXIF применяется к пикселям, файл перезаписывается под
+    тем же именем.
+
+    :return: True, если файл был перезаписан.
+    """
+    if not image:
+        return False
+    with image.open("rb") as source:
+        opened = Image.open(source)
+        if not opened.getexif():
+            return False
+        image_format = opened.format
+        cleaned = ImageOps.exif_transpose(opened)
+    cleaned.info.pop("exif", None)
+    buffer = BytesIO()
+    save_kwargs = {"quality": JPEG_QUALITY} if image_format == "JPEG" else {}
+    cleaned.save(buffer, format=image_format, **save_kwargs)
+    image.storage.delete(image.name)
+    image.storage.save(image.name, ContentFile(buffer.getvalue()))
+    return True
+
+
+def get_renditions(image: FieldFile, stored: dict) -> List[Tuple[str, int]]:
+    """
+    Возвращает пары `(url, ширина)` копий, уже созданных обработчиком.
+
+    Ни хранилище, ни файлы изображения не читаются: копии берутся из
+    `Post.image_renditions`. Пока обработчик не создал копии нового
+    изображения, список пуст и выводится оригинал.
+    """
+    if not image or not stored or stored.get("name") != image.name:
+        return []
+    return [
+        (image.storage.url(rendition_name(image.name, width)), real_width)
+        for width, real_width in stored["widths"]
+    ]
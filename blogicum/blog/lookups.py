@@ -0,0 +1,149 @@
+"""
+Справочники категорий и местоположений в памяти процесса.
+
+Таблицы маленькие и меняются редко, поэтому каждый процесс держит их
+целиком и перечитывает, когда меняется версия в общем кеше. Версию
+меняют сигналы сохранения и удаления категорий и местоположений; проверка
+версии — одно чтение из кеша, без запросов к базе. Изменения через
+`QuerySet.update()` сигналов не вызывают и нуждаются в
+`invalidate_lookups()`.
+
+Версия видна другим процессам, только если кеш общий (см. `CACHES`).
+На случай кеша в памяти процесса или потерянной смены версии справочники
+всё равно перечитываются не реже раза в `LOOKUPS_MAX_AGE` секунд.
+
+По справочникам ищется категория по слагу, строится меню категорий, а
+ленты подставляют категорию и местоположение в публикации вместо JOIN.
+Справочники читаются из основной базы, как и пишутся: реплика могла
+ещё не получить изменение, ради которого сменилась версия.
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from blog.constants import LOOKUPS_MAX_AGE
+from blog.models import Category, Location
+
+LOOKUPS_VERSION_KEY = "blog:lookups-version"
+
+
+class Lookups(NamedTuple):
+    version: int
+    loaded_at: float
+    categories: Dict[int, Category]
+    locations: Dict[int, Location]
+    categories_by_slug: Dict[str, Category]
+
+
+_lock = threading.Lock()
+_lookups: Optional[Lookups] = None
+
+
+def _version() -> int:
+    version = cache.get(LOOKUPS_VERSION_KEY)
+    if version is None:
+        cache.add(LOOKUPS_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(LOOKUPS_VERSION_KEY)
+    return version
+
+
+def _is_fresh(lookups: Optional[Lookups], version: int) -> bool:
+    return (
+        lookups is not None
+        and lookups.version == version
+        and time.monotonic() - lookups.loaded_at < LOOKUPS_MAX_AGE
+    )
+
+
+def get_lookups() -> Lookups:
+    """
+    Справочники текущей версии.
+
+    Перечитываются при смене версии и по истечении `LOOKUPS_MAX_AGE`.
+    """
+    global _lookups
+    version = _version()
+    lookups = _lookups
+    if _is_fresh(lookups, version):
+        return lookups
+    with _lock:
+        if not _is_fresh(_lookups, version):
+            categories = {
+                category.pk: category
+                for category in Category.objects.using(DEFAULT_DB_ALIAS)
+            }
+            _lookups = Lookups(
+                version=version,
+                loaded_at=time.monotonic(),
+                categories=categories,
+                locations={
+                    location.pk: location
+                    for location in Location.objects.using(DEFAULT_DB_ALIAS)
+                },
+                categories_by_slug={
+                    category.slug: category
+                    for category in categories.values()
+                },
+            )
+        return _lookups
+
+
+def invalidate_lookups() -> None:
+    """
+    Меняет версию справочников во всех процессах.
+
+    Версия меняется сразу и ещё раз после фиксации транзакции, чтобы
+    процесс, перечитавший справочники до фиксации, не закешировал
+    старые данные под новой версией.
+    """
+    cache.set(LOOKUPS_VERSION_KEY, time.time_ns(), timeout=None)
+    transaction.on_commit(
+        lambda: cache.set(LOOKUPS_VERSION_KEY, time.time_ns(), timeout=None)
+    )
+
+
+def get_published_category(slug: str) -> Optional[Category]:
+    category = get_lookups().categories_by_slug.get(slug)
+    if category is None or not category.is_published:
+        return None
+    return category
+
+
+def published_categories() -> List[Category]:
+    """Опубликованные категории в алфавитном порядке."""
+    return sorted(
+        (
+            category
+            for category in get_lookups().categories.values()
+            if category.is_published
+        ),
+        key=lambda category: category.title,
+    )
+
+
+def published_category_ids() -> List[int]:
+    return [
+        pk
+        for pk, category in get_lookups().categories.items()
+        if category.is_published
+    ]
+
+
+def attach_lookups(posts: Iterable) -> None:
+    """
+    Подставляет в публикации категории и местоположения из справочников.
+
+    Публикации, чьей категории или местоположения ещё нет в справочнике,
+    загрузят их сами при обращении.
+    """
+    lookups = get_lookups()
+    for post in posts:
+        category = lookups.categories.get(post.category_id)
+        if category is not None:
+            post.category = category
+        location = lookups.locations.get(post.location_id)
+        if location is not None:
+            post.location = location
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_renditions
+from blog.models import Post
+from blog.services import store_renditions
+
+
+class Command(BaseCommand):
+    help = (
+        "Создаёт недостающие уменьшенные копии изображений публикаций и"
+        " записывает их в публикации."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Пересоздать уже существующие копии.",
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image="").only("id", "image")
+        processed = failed = 0
+        for post in posts.iterator():
+            try:
+                store_renditions(
+                    post,
+                    generate_renditions(post.image, force=options["force"]),
+                )
+                processed += 1
+            except (OSError, ValueError) as error:
+                failed += 1
+                self.stderr.write(f"Публикация {post.id}: {error}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Обработано изображений: {processed}, ошибок: {failed}."
+            )
+        )
@@ -0,0 +1,113 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+
+from blog.constants import POSTS_LIMIT
+from blog.models import Category, Post
+from blog.selectors import get_post_queryset
+from blog.services import make_excerpt
+
+
+def _timed(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def _fetched_bytes(queryset) -> int:
+    """Объём значений строк, которые СУБД отдаёт на запрос страницы."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return sum(
+            len(str(value).encode())
+            for row in cursor.fetchall()
+            for value in row
+            if value is not None
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает страницу главной ленты со всеми столбцами и с "
+        "профилем выборки `feed` во временной тестовой базе."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=1000)
+        parser.add_argument(
+            "--words",
+            type=int,
+            default=2000,
+            help="Количество слов в тексте каждой публикации.",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            self._seed(options["posts"], options["words"])
+            self._measure(options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def _seed(self, total: int, words: int) -> None:
+        author = get_user_model().objects.create(username="bench")
+        category = Category.objects.create(
+            title="Тест", description="Тест", slug="bench"
+        )
+        text = " ".join(f"слово{i}" for i in range(words))
+        now = timezone.now()
+        Post.objects.bulk_create(
+            (
+                Post(
+                    title=f"Публикация {i}",
+                    text=text,
+                    excerpt=make_excerpt(text),
+                    pub_date=now - timezone.timedelta(minutes=i + 1),
+                    author=author,
+                    category=category,
+                )
+                for i in range(total)
+            ),
+            batch_size=500,
+        )
+        self.stdout.write(
+            f"Публикаций: {total}, текст каждой — {len(text)} символов."
+        )
+
+    def _measure(self, repeat: int) -> None:
+        for label, projection in (
+            ("Все столбцы", None),
+            ("Профиль feed", "feed"),
+        ):
+            queryset = get_post_queryset(
+                use_filters=True,
+                add_annotations=True,
+                projection=projection,
+            )[:POSTS_LIMIT]
+
+            def render_page():
+                return render_to_string(
+                    "blog/index.html", {"page_obj": list(queryset.all())}
+                )
+
+            elapsed, _ = _timed(render_page, repeat)
+            self.stdout.write(
+                f"{label}: {_fetched_bytes(queryset) / 1024:.1f} КиБ "
+                f"данных на страницу, запрос и отрисовка {elapsed:.1f} мс."
+            )
@@ -0,0 +1,102 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.template import Context, Template
+from django.test import Client
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+
+from blog.constants import POSTS_LIMIT
+from blog.models import Category, Post
+
+# Прежний цикл шаблона `includes/paginator.html`: ссылка на каждую страницу.
+FULL_RANGE_TEMPLATE = Template(
+    "{% for i in page_obj.paginator.page_range %}"
+    '<li class="page-item"><a class="page-link" href="?page={{ i }}">'
+    "{{ i }}</a></li>"
+    "{% endfor %}"
+)
+
+
+def _timed(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Измеряет отрисовку первой страницы главной ленты на большом "
+        "количестве публикаций во временной тестовой базе."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            self._seed(options["posts"])
+            self._measure(options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def _seed(self, total: int) -> None:
+        author = get_user_model().objects.create(username="bench")
+        category = Category.objects.create(
+            title="Тест", description="Тест", slug="bench"
+        )
+        now = timezone.now()
+        Post.objects.bulk_create(
+            (
+                Post(
+                    title=f"Публикация {i}",
+                    text="Текст публикации. " * 20,
+                    pub_date=now - timezone.timedelta(minutes=i + 1),
+                    author=author,
+                    category=category,
+                )
+                for i in range(total)
+            ),
+            batch_size=5000,
+        )
+        self.stdout.write(f"Публикаций: {total}.")
+
+    def _measure(self, repeat: int) -> None:
+        client = Client()
+
+        def render_index():
+            cache.clear()
+            return client.get("/")
+
+        elapsed, response = _timed(render_index, repeat)
+        page_obj = response.context["page_obj"]
+        self.stdout.write(
+            f"Страница 1 из {page_obj.paginator.num_pages}: {elapsed:.1f} мс, "
+            f"{len(response.content) / 1024:.1f} КиБ HTML, "
+            f"ссылок на страницы {len(page_obj.elided_page_range)}."
+        )
+
+        context = Context({"page_obj": page_obj})
+        elapsed, html = _timed(
+            lambda: FULL_RANGE_TEMPLATE.render(context), repeat
+        )
+        self.stdout.write(
+            f"Цикл по всем страницам (прежний шаблон): {elapsed:.1f} мс, "
+            f"{len(html) / 1024:.1f} КиБ HTML, ссылок на страницы "
+            f"{page_obj.paginator.num_pages} "
+            f"(по {POSTS_LIMIT} публикаций на странице)."
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.services import rebuild_comment_counts
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает денормализованные счётчики комментариев публикаций."
+
+    def handle(self, *args, **options):
+        updated = rebuild_comment_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f"Обновлено публикаций: {updated}.")
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:13
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Индексы на PostgreSQL строятся CONCURRENTLY, вне транзакции.
+    atomic = False
+
+    dependencies = [
+        ('blog', '0007_post_comment_count'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-pub_date'], name='post_published_pub_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', '-pub_date'], name='post_category_pub_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='post',
+            index=models.Index(fields=['author', '-pub_date'], name='post_author_pub_date_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 3.2.16 on 2026-10-17 09:40
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE blog_post_search USING fts5("
+    "title, text, tokenize = 'unicode61 remove_diacritics 2')",
+    "INSERT INTO blog_post_search (rowid, title, text) "
+    "SELECT id, title, text FROM blog_post",
+]
+SQLITE_BACKWARD = ["DROP TABLE blog_post_search"]
+
+POSTGRESQL_FORWARD = [
+    "ALTER TABLE blog_post ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(text, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX post_search_vector_idx ON blog_post "
+    "USING gin (search_vector)",
+]
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX post_search_vector_idx",
+    "ALTER TABLE blog_post DROP COLUMN search_vector",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, []):
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({
+                "sqlite": SQLITE_FORWARD,
+                "postgresql": POSTGRESQL_FORWARD,
+            }),
+            _run({
+                "sqlite": SQLITE_BACKWARD,
+                "postgresql": POSTGRESQL_BACKWARD,
+            }),
+        ),
+    ]
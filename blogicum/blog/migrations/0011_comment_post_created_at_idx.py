@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-17 10:25
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Индексы на PostgreSQL строятся CONCURRENTLY, вне транзакции.
+    atomic = False
+
+    dependencies = [
+        ("blog", "0010_post_search"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "created_at"],
+                name="comment_post_created_at_idx",
+            ),
+        ),
+    ]
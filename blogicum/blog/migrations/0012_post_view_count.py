@@ -0,0 +1,22 @@
+# Generated by Django 3.2.16 on 2026-10-17 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0011_comment_post_created_at_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="view_count",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                verbose_name="Количество просмотров",
+            ),
+        ),
+    ]
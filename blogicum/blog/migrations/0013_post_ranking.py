@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_view_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostRanking',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('popular_score', models.FloatField(verbose_name='Популярность')),
+                ('trending_score', models.FloatField(verbose_name='Актуальность')),
+                ('views_seen', models.PositiveBigIntegerField(default=0, verbose_name='Учтено просмотров')),
+                ('comments_seen', models.PositiveIntegerField(default=0, verbose_name='Учтено комментариев')),
+                ('updated_at', models.DateTimeField(verbose_name='Пересчитано')),
+            ],
+            options={
+                'verbose_name': 'рейтинг публикации',
+                'verbose_name_plural': 'Рейтинги публикаций',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='postranking',
+            index=models.Index(fields=['-popular_score'], name='ranking_popular_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postranking',
+            index=models.Index(fields=['-trending_score'], name='ranking_trending_score_idx'),
+        ),
+    ]
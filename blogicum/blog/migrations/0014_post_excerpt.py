@@ -0,0 +1,43 @@
+# Generated by Django 3.2.16 on 2026-10-17 15:20
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+BATCH_SIZE = 1000
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    posts = Post.objects.only("id", "text").order_by("pk")
+    last_pk = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        for post in batch:
+            excerpt = Truncator(post.text).words(10, truncate=" …")
+            post.excerpt = Truncator(excerpt).chars(512)
+        Post.objects.bulk_update(batch, ("excerpt",))
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0013_post_ranking"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Заполняется из текста при сохранении; для лент.",
+                max_length=512,
+                verbose_name="Начало текста",
+            ),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
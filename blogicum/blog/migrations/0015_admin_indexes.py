@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Индексы на PostgreSQL строятся CONCURRENTLY, вне транзакции.
+    atomic = False
+
+    dependencies = [
+        ("blog", "0014_post_excerpt"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=("is_published", "-pub_date"),
+                name="post_is_published_pub_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=("-pub_date",),
+                name="post_pub_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="comment",
+            index=models.Index(
+                fields=["created_at"],
+                name="comment_created_at_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0015_admin_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Заполняет обработчик изображений: имя оригинала и"
+                " ширины созданных копий.",
+                verbose_name="Копии изображения",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-17 05:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_post_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostViewBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_id', models.BigIntegerField(db_index=True, verbose_name='Публикация')),
+                ('views', models.PositiveIntegerField(verbose_name='Просмотров')),
+            ],
+            options={
+                'verbose_name': 'пачка просмотров',
+                'verbose_name_plural': 'Пачки просмотров',
+            },
+        ),
+    ]
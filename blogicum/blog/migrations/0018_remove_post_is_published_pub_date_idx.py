@@ -0,0 +1,24 @@
+# Generated by Django 3.2.16 on 2026-10-17 21:10
+
+from django.db import migrations
+
+from core.operations import RemoveIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Индекс на PostgreSQL удаляется CONCURRENTLY, вне транзакции.
+    atomic = False
+
+    dependencies = [
+        ("blog", "0017_post_view_batch"),
+    ]
+
+    operations = [
+        # Повторял частичный `post_published_pub_date_idx` для
+        # опубликованных и `post_pub_date_idx` для остальных.
+        RemoveIndexConcurrently(
+            model_name="post",
+            name="post_is_published_pub_date_idx",
+        ),
+    ]
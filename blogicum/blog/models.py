@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
-from blog.constants import MAX_NAME_LENGTH
+from blog.constants import EXCERPT_MAX_LENGTH, MAX_NAME_LENGTH
 from core.models import PublishedCreatedAtModel
 
 User = get_user_model()
@@ -50,6 +50,13 @@ class Post(PublishedCreatedAtModel):
         verbose_name="Заголовок",
     )
     text = models.TextField(verbose_name="Текст")
+    excerpt = models.CharField(
+        max_length=EXCERPT_MAX_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name="Начало текста",
+        help_text="Заполняется из текста при сохранении; для лент.",
+    )
     pub_date = models.DateTimeField(
         verbose_name="Дата и время публикации",
         help_text=(
@@ -79,16 +86,119 @@ class Post(PublishedCreatedAtModel):
         related_name="posts",
     )
     image = models.ImageField("Фото", upload_to="post_images", blank=True)
+    image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Копии изображения",
+        help_text="Заполняет обработчик изображений: имя оригинала и ширины"
+        " созданных копий.",
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество комментариев",
+    )
+    view_count = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество просмотров",
+    )
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=("-pub_date",),
+                condition=models.Q(is_published=True),
+                name="post_published_pub_date_idx",
+            ),
+            models.Index(
+                fields=("category", "-pub_date"),
+                condition=models.Q(is_published=True),
+                name="post_category_pub_date_idx",
+            ),
+            models.Index(
+                fields=("author", "-pub_date"),
+                name="post_author_pub_date_idx",
+            ),
+            # Для админки: все публикации и диапазон дат. Фильтр по
+            # опубликованным берёт частичный индекс лент.
+            models.Index(
+                fields=("-pub_date",),
+                name="post_pub_date_idx",
+            ),
+        )
 
     def __str__(self):
         return self.title
 
 
+class PostViewBatch(models.Model):
+    """
+    Пачка просмотров публикации, ещё не записанная в `Post.view_count`.
+
+    Пачки добавляет счётчик просмотров веб-процессов, суммирует и удаляет
+    фоновая задача, см. `blog.views_counter`. Внешнего ключа нет: пачка
+    удалённой публикации просто пропускается при сбросе.
+    """
+
+    post_id = models.BigIntegerField(
+        db_index=True, verbose_name="Публикация"
+    )
+    views = models.PositiveIntegerField(verbose_name="Просмотров")
+
+    class Meta:
+        verbose_name = "пачка просмотров"
+        verbose_name_plural = "Пачки просмотров"
+
+
+class PostRanking(models.Model):
+    """
+    Рейтинги публикации для лент «Популярное» и «Обсуждают сейчас».
+
+    Пересчитывается фоновой задачей, см. `blog.ranking`.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name="Публикация",
+        related_name="ranking",
+    )
+    popular_score = models.FloatField(verbose_name="Популярность")
+    trending_score = models.FloatField(verbose_name="Актуальность")
+    views_seen = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Учтено просмотров",
+    )
+    comments_seen = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Учтено комментариев",
+    )
+    updated_at = models.DateTimeField(verbose_name="Пересчитано")
+
+    class Meta:
+        verbose_name = "рейтинг публикации"
+        verbose_name_plural = "Рейтинги публикаций"
+        indexes = (
+            models.Index(
+                fields=("-popular_score",),
+                name="ranking_popular_score_idx",
+            ),
+            models.Index(
+                fields=("-trending_score",),
+                name="ranking_trending_score_idx",
+            ),
+        )
+
+    def __str__(self):
+        return str(self.post_id)
+
+
 class Comment(models.Model):
     text = models.TextField(verbose_name="Текст")
     post = models.ForeignKey(
@@ -112,6 +222,16 @@ class Comment(models.Model):
         verbose_name = "комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ("created_at",)
+        indexes = [
+            models.Index(
+                fields=["post", "created_at"],
+                name="comment_post_created_at_idx",
+            ),
+            models.Index(
+                fields=["created_at"],
+                name="comment_created_at_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.text
@@ -0,0 +1,215 @@
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from typing import Optional
+
+from django.core.paginator import Paginator
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from blog.constants import FEED_COUNT_ESTIMATE_FROM
+from blog.counts import estimate_count
+
+MAX_BIGINT = 2 ** 63
+
+
+class CursorPage:
+    """
+    Страница курсорной (keyset) пагинации.
+
+    Повторяет интерфейс `django.core.paginator.Page` в той части, которую
+    использует шаблон `includes/paginator.html`, но не знает ни номера
+    страницы, ни общего количества записей.
+    """
+
+    is_cursor = True
+
+    def __init__(
+        self,
+        object_list: list,
+        next_cursor: Optional[str],
+        previous_cursor: Optional[str],
+    ):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self.object_list)} items>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Пагинация по ключу `(key, id)` без `COUNT(*)` и `OFFSET`.
+
+    По умолчанию ключ — `pub_date`, записи отдаются «от новых к старым».
+    Курсор — непрозрачный токен, кодирующий границу страницы и
+    направление перехода.
+
+    :param key: Поле или аннотация, по которой упорядочены записи.
+    :param descending: Порядок по убыванию ключа (и `id`).
+    :param key_type: Тип значений ключа: `datetime` или `float`. Курсор
+        с ключом другого типа считается некорректным.
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        per_page: int,
+        key: str = "pub_date",
+        descending: bool = True,
+        key_type: type = datetime,
+    ):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.key = key
+        self.descending = descending
+        self.key_type = key_type
+
+    @staticmethod
+    def encode_cursor(value, pk: int, reverse: bool) -> str:
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps(
+            {"d": value, "i": pk, "r": int(reverse)},
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(
+        cursor: str, key_type: type = datetime
+    ) -> Optional[tuple]:
+        """
+        Возвращает `(ключ, id, reverse)` или None для битого токена.
+
+        Токен с ключом не того типа, что `key_type`, тоже считается битым:
+        сравнение такого ключа с полем упало бы в запросе.
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            value, pk = payload["d"], payload["i"]
+            if key_type is datetime:
+                if not isinstance(value, str):
+                    return None
+                value = datetime.fromisoformat(value)
+                if value.tzinfo is None:
+                    return None
+            elif isinstance(value, bool) or not isinstance(
+                value, (int, float)
+            ):
+                return None
+            else:
+                value = float(value)
+                if not math.isfinite(value):
+                    return None
+            if (
+                isinstance(pk, bool)
+                or not isinstance(pk, int)
+                or not 0 < pk < MAX_BIGINT
+            ):
+                return None
+            return value, pk, bool(payload["r"])
+        except (
+            binascii.Error,
+            UnicodeDecodeError,
+            ValueError,
+            KeyError,
+            TypeError,
+        ):
+            return None
+
+    def _ordered(self, backwards: bool) -> QuerySet:
+        prefix = "-" if self.descending != backwards else ""
+        return self.queryset.order_by(f"{prefix}{self.key}", f"{prefix}id")
+
+    def _after(self, value, pk: int, backwards: bool) -> Q:
+        lookup = "lt" if self.descending != backwards else "gt"
+        return Q(**{f"{self.key}__{lookup}": value}) | Q(
+            **{self.key: value, f"id__{lookup}": pk}
+        )
+
+    def get_page(self, cursor: Optional[str]) -> CursorPage:
+        """
+        Возвращает страницу после (или перед) границей из курсора.
+
+        Некорректный или пустой курсор приводит к первой странице.
+        """
+        position = (
+            self.decode_cursor(cursor, self.key_type) if cursor else None
+        )
+        queryset = self._ordered(backwards=False)
+        reverse = False
+        if position is not None:
+            value, pk, reverse = position
+            queryset = self._ordered(backwards=reverse).filter(
+                self._after(value, pk, backwards=reverse)
+            )
+
+        items = list(queryset[: self.per_page + 1])
+        has_more = len(items) > self.per_page
+        if reverse and not has_more:
+            # Перед границей не больше страницы: это начало ленты, и
+            # первая страница должна быть полной.
+            return self.get_page(None)
+        items = items[: self.per_page]
+        if reverse:
+            items.reverse()
+        if not items:
+            return CursorPage(items, None, None)
+
+        has_next = has_more if not reverse else True
+        has_previous = has_more if reverse else position is not None
+        first, last = items[0], items[-1]
+        return CursorPage(
+            items,
+            next_cursor=(
+                self.encode_cursor(getattr(last, self.key), last.id, False)
+                if has_next
+                else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(getattr(first, self.key), first.id, True)
+                if has_previous
+                else None
+            ),
+        )
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Постраничный пагинатор, который на больших таблицах PostgreSQL берёт
+    количество записей из оценки планировщика вместо `COUNT(*)`.
+
+    Оценка используется, начиная с `FEED_COUNT_ESTIMATE_FROM` строк; на
+    меньших выборках и на SQLite количество точное.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        if isinstance(self.object_list, QuerySet):
+            estimated = estimate_count(self.object_list)
+            if estimated is not None and estimated >= FEED_COUNT_ESTIMATE_FROM:
+                return estimated
+        return super().count
@@ -0,0 +1,84 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+from blog.cache import invalidate_feeds, post_feeds
+from blog.constants import PUBLICATION_BOUNDARY_MAX_AGE
+from blog.counts import adjust_feed_counts, counted_feeds
+from blog.models import Post
+
+PUBLICATION_STATE_KEY = "blog:publication-state"
+PUBLICATION_SHIFT_KEY = "blog:publication-shift:{state}"
+
+
+def refresh_publication_schedule(previous: Optional[dict] = None) -> dict:
+    """
+    Сдвигает границу видимости публикаций на текущий момент.
+
+    Публикации, чья `pub_date` попала между прежней и новой границей,
+    считаются только что вышедшими: ленты с ними сбрасываются, а счётчики
+    лент увеличиваются.
+
+    Сдвиг от каждой границы выполняет один вызывающий: остальные, кто
+    застал ту же границу (другие процессы, у которых она истекла в тот же
+    момент), получают состояние из кеша и счётчики не трогают — иначе
+    вышедшие публикации были бы посчитаны несколько раз.
+
+    :param previous: Прежнее состояние расписания, если оно известно.
+    :return: Новое состояние `{"id": ..., "boundary": ..., "next": ...}`.
+    """
+    previous = previous or cache.get(PUBLICATION_STATE_KEY)
+    now = timezone.now()
+    if previous is not None:
+        claim = PUBLICATION_SHIFT_KEY.format(
+            state=previous.get("id") or previous["boundary"].isoformat()
+        )
+        if not cache.add(claim, 1, timeout=PUBLICATION_BOUNDARY_MAX_AGE):
+            return cache.get(PUBLICATION_STATE_KEY) or previous
+        went_live = Post.objects.filter(
+            is_published=True,
+            pub_date__gt=previous["boundary"],
+            pub_date__lte=now,
+        ).values_list("pk", flat=True)
+        went_live = list(went_live)
+        invalidate_feeds(post_feeds(went_live))
+        adjust_feed_counts(counted_feeds(went_live, now))
+    state = {
+        "id": uuid.uuid4().hex,
+        "boundary": now,
+        "next": Post.objects.filter(
+            is_published=True, pub_date__gt=now
+        ).aggregate(next=Min("pub_date"))["next"],
+    }
+    cache.set(PUBLICATION_STATE_KEY, state, timeout=None)
+    return state
+
+
+def visible_as_of() -> datetime:
+    """
+    Момент, на который лента показывает опубликованные записи.
+
+    Между границами (ближайшая отложенная публикация или
+    `PUBLICATION_BOUNDARY_MAX_AGE` секунд) значение не меняется, поэтому
+    запросы лент одинаковы и их можно кешировать. Граница не отстаёт от
+    `timezone.now()` ни на одну публикацию: следующая отложенная запись
+    выходит строго после неё.
+
+    Состояние хранится в общем кеше (`CACHES`): отложенная публикация,
+    сохранённая в одном процессе, сдвигает `next` во всех процессах.
+    """
+    now = timezone.now()
+    state = cache.get(PUBLICATION_STATE_KEY)
+    if (
+        state is None
+        or state["next"] is not None
+        and state["next"] <= now
+        or now - state["boundary"]
+        > timedelta(seconds=PUBLICATION_BOUNDARY_MAX_AGE)
+    ):
+        state = refresh_publication_schedule(state)
+    return state["boundary"]
@@ -0,0 +1,127 @@
+"""
+Рейтинги публикаций для лент «Популярное» и «Обсуждают сейчас».
+
+Вклад просмотра — 1, комментария — `RANKING_COMMENT_WEIGHT`. Вклад
+затухает вдвое за период полураспада рейтинга. Чтобы не переписывать
+все строки при каждом пересчёте, вклады не уменьшаются со временем, а
+увеличиваются (forward decay): вклад в момент `t` умножается на
+`2 ** ((t - RANKING_EPOCH) / half_life)`. Порядок публикаций при этом тот
+же, а пересчитывать нужно только публикации с новыми просмотрами или
+комментариями. В таблице хранится двоичный логарифм суммы, чтобы число
+не переполнялось.
+
+Вклад, накопленный до первого пересчёта публикации, относится к моменту
+её публикации.
+"""
+import math
+from datetime import datetime
+from typing import Optional
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from blog.cache import POPULAR_FEED, TRENDING_FEED, invalidate_feeds
+from blog.constants import (
+    POPULAR_HALF_LIFE,
+    RANKING_BATCH_SIZE,
+    RANKING_COMMENT_WEIGHT,
+    TRENDING_HALF_LIFE,
+)
+from blog.models import Post, PostRanking
+
+RANKING_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+RANKINGS = {
+    "popular": POPULAR_HALF_LIFE,
+    "trending": TRENDING_HALF_LIFE,
+}
+
+
+def log_score(
+    previous: Optional[float],
+    weight: float,
+    at: datetime,
+    half_life: int,
+) -> float:
+    """
+    Добавляет к рейтингу вклад `weight`, полученный в момент `at`.
+
+    :param previous: Прежний рейтинг (логарифм) или None.
+    :return: Новый рейтинг.
+    """
+    age = (at - RANKING_EPOCH).total_seconds()
+    added = age / half_life + math.log2(weight)
+    if previous is None:
+        return added
+    high, low = max(previous, added), min(previous, added)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def _changed_posts():
+    return Post.objects.filter(
+        Q(ranking__isnull=True, view_count__gt=0)
+        | Q(ranking__isnull=True, comment_count__gt=0)
+        | Q(view_count__gt=F("ranking__views_seen"))
+        | Q(comment_count__gt=F("ranking__comments_seen"))
+    ).select_related("ranking")
+
+
+def _rank(post: Post, now: datetime) -> PostRanking:
+    ranking = getattr(post, "ranking", None)
+    if ranking is None:
+        ranking = PostRanking(post=post)
+        at = min(post.pub_date, now)
+        scores = dict.fromkeys(RANKINGS)
+    else:
+        at = now
+        scores = {
+            name: getattr(ranking, f"{name}_score") for name in RANKINGS
+        }
+    weight = max(post.view_count - ranking.views_seen, 0) + max(
+        post.comment_count - ranking.comments_seen, 0
+    ) * RANKING_COMMENT_WEIGHT
+    if weight:
+        for name, half_life in RANKINGS.items():
+            setattr(
+                ranking,
+                f"{name}_score",
+                log_score(scores[name], weight, at, half_life),
+            )
+    ranking.views_seen = post.view_count
+    ranking.comments_seen = post.comment_count
+    ranking.updated_at = now
+    return ranking
+
+
+def update_rankings(batch_size: int = RANKING_BATCH_SIZE) -> int:
+    """
+    Пересчитывает рейтинги публикаций с новыми просмотрами или
+    комментариями.
+
+    :return: Количество пересчитанных публикаций.
+    """
+    now = timezone.now()
+    updated = 0
+    while True:
+        posts = list(_changed_posts()[:batch_size])
+        if not posts:
+            break
+        created, changed = [], []
+        for post in posts:
+            exists = hasattr(post, "ranking")
+            ranking = _rank(post, now)
+            (changed if exists else created).append(ranking)
+        PostRanking.objects.bulk_create(created)
+        PostRanking.objects.bulk_update(
+            changed,
+            (
+                "popular_score",
+                "trending_score",
+                "views_seen",
+                "comments_seen",
+                "updated_at",
+            ),
+        )
+        updated += len(posts)
+    if updated:
+        invalidate_feeds({POPULAR_FEED, TRENDING_FEED})
+    return updated
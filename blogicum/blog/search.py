@@ -0,0 +1,187 @@
+"""
+Полнотекстовый поиск по публикациям.
+
+На SQLite индекс — виртуальная таблица FTS5 `blog_post_search` (rowid
+совпадает с id публикации), она обновляется сигналами при сохранении и
+удалении публикации. На PostgreSQL — вычисляемый столбец
+`blog_post.search_vector` с GIN-индексом, его поддерживает сама СУБД.
+Обе структуры создаёт миграция `0010_post_search`.
+
+Ранг нормирован так, что меньшее значение — лучшее совпадение: `bm25()`
+в SQLite уже отрицателен, `ts_rank_cd` в PostgreSQL берётся со знаком
+минус.
+"""
+import re
+from typing import Iterable, List, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import (
+    BooleanField,
+    FloatField,
+    QuerySet,
+    TextField,
+    Value,
+)
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = "blog_post_search"
+SEARCH_CONFIG = "russian"
+# Границы совпадения в сниппете; экранирование и разметку добавляет
+# фильтр `highlight`.
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+SNIPPET_WORDS = 24
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _words(query: str) -> List[str]:
+    return _WORD_RE.findall(query)
+
+
+def fts_query(query: str) -> Optional[str]:
+    """
+    Превращает пользовательский ввод в безопасный запрос FTS5.
+
+    Каждое слово ищется как префикс, слова объединяются через AND.
+    Операторы FTS5 и кавычки из ввода не попадают в запрос.
+
+    :return: Запрос для MATCH или None, если в вводе нет слов.
+    """
+    words = _words(query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def tsquery(query: str) -> Optional[str]:
+    """То же для `to_tsquery` PostgreSQL: `слово:* & слово:*`."""
+    words = _words(query)
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def index_posts(posts: Iterable, using: str = DEFAULT_DB_ALIAS) -> None:
+    """Добавляет публикации в индекс SQLite или обновляет их там."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    rows = [(post.id, post.title, post.text) for post in posts]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [(row[0],) for row in rows],
+        )
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, text) "
+            "VALUES (%s, %s, %s)",
+            rows,
+        )
+
+
+def unindex_post(post_id: int, using: str = DEFAULT_DB_ALIAS) -> None:
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [post_id]
+        )
+
+
+def rebuild_search_index(using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    Заново строит индекс SQLite по всем публикациям.
+
+    :return: Количество проиндексированных публикаций.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, text) "
+            "SELECT id, title, text FROM blog_post"
+        )
+        return cursor.rowcount
+
+
+def _sqlite_search(queryset: QuerySet, query: str) -> QuerySet:
+    match = (
+        f"SELECT {{select}} FROM {SEARCH_TABLE} "
+        f"WHERE {SEARCH_TABLE} MATCH %s "
+        f'AND {SEARCH_TABLE}.rowid = "blog_post"."id"'
+    )
+    return queryset.filter(
+        id__in=RawSQL(
+            f"SELECT rowid FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s",
+            [query],
+        )
+    ).annotate(
+        rank=RawSQL(
+            match.format(select=f"bm25({SEARCH_TABLE}, 10.0, 1.0)"),
+            [query],
+            output_field=FloatField(),
+        ),
+        snippet=RawSQL(
+            match.format(
+                select=(
+                    f"snippet({SEARCH_TABLE}, 1, '{MATCH_START}', "
+                    f"'{MATCH_END}', '…', {SNIPPET_WORDS})"
+                )
+            ),
+            [query],
+            output_field=TextField(),
+        ),
+    )
+
+
+def _postgresql_search(queryset: QuerySet, query: str) -> QuerySet:
+    to_tsquery = f"to_tsquery('{SEARCH_CONFIG}', %s)"
+    headline_options = (
+        f"StartSel={MATCH_START}, StopSel={MATCH_END}, "
+        f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}"
+    )
+    return queryset.filter(
+        RawSQL(
+            f'"blog_post"."search_vector" @@ {to_tsquery}',
+            [query],
+            output_field=BooleanField(),
+        )
+    ).annotate(
+        rank=RawSQL(
+            # float8: ранг попадает в курсор и сравнивается на равенство.
+            f'-ts_rank_cd("blog_post"."search_vector", {to_tsquery})::float8',
+            [query],
+            output_field=FloatField(),
+        ),
+        snippet=RawSQL(
+            f"ts_headline('{SEARCH_CONFIG}', \"blog_post\".\"text\", "
+            f"{to_tsquery}, %s)",
+            [query, headline_options],
+            output_field=TextField(),
+        ),
+    )
+
+
+def search_posts(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Оставляет в `queryset` публикации, подходящие под запрос.
+
+    Добавляет аннотации `rank` (меньше — лучше) и `snippet` — фрагмент
+    текста с отмеченными совпадениями. Порядок не задаётся: его
+    определяет пагинатор.
+    """
+    postgresql = connections[queryset.db].vendor == "postgresql"
+    prepared = tsquery(query) if postgresql else fts_query(query)
+    if prepared is None:
+        return queryset.annotate(
+            rank=Value(0.0, output_field=FloatField()),
+            snippet=Value("", output_field=TextField()),
+        ).none()
+    if postgresql:
+        return _postgresql_search(queryset, prepared)
+    return _sqlite_search(queryset, prepared)
@@ -1,49 +1,228 @@
-from django.db.models import Count, QuerySet
-from django.utils import timezone
-from django.core.paginator import Paginator
+from typing import List, Optional, Union
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.core.paginator import Page, Paginator
 from django.http import HttpRequest
 
-from blog.models import Post
-from blog.constants import POSTS_LIMIT
+from blog.models import Comment, Post
+from blog.constants import (
+    COMMENTS_LIMIT,
+    PAGINATOR_ON_EACH_SIDE,
+    PAGINATOR_ON_ENDS,
+    POSTS_LIMIT,
+    RANKED_FEED_LIMIT,
+)
+from blog.counts import feed_count
+from blog.lookups import attach_lookups, published_category_ids
+from blog.pagination import CursorPage, CursorPaginator
+from blog.ranking import RANKINGS
+from blog.publication import visible_as_of
+from blog.search import search_posts
+from blog.views_counter import pending_views, stored_views
+
+
+# Поля карточки публикации (`includes/post_card.html`) и её версии в кеше.
+_CARD_FIELDS = (
+    "title",
+    "excerpt",
+    "pub_date",
+    "is_published",
+    "image",
+    "image_renditions",
+    "comment_count",
+    "category",
+    "location",
+)
+
+# Профили выборки: какие поля публикации и связанных моделей загружать и
+# какие связи присоединять. Пароль и даты входа автора и полный текст в
+# ленты не попадают. Категории и местоположения не присоединяются, а
+# берутся из справочников `blog.lookups`.
+POST_PROJECTIONS = {
+    "feed": {
+        "related": ("author",),
+        "fields": (*_CARD_FIELDS, "author__username"),
+    },
+    "detail": {
+        "related": ("author",),
+        "fields": (*_CARD_FIELDS, "author__username", "text", "view_count"),
+    },
+    # Автор всех публикаций — владелец профиля, его не присоединяем.
+    "profile": {
+        "related": (),
+        "fields": (*_CARD_FIELDS, "author"),
+    },
+}
 
 
 def get_post_queryset(
     use_filters=False,
     add_annotations=False,
+    projection: Optional[str] = None,
 ) -> QuerySet[Post]:
     """
     Возвращает базовый QuerySet для публикаций с возможностью фильтрации
     и аннотации.
 
     :param use_filters: Учитывать фильтры (скрытые и отложенные посты).
-    :param add_annotations: Добавлять аннотации и сортировку.
+        Опубликованные категории берутся из справочника, без JOIN.
+        Отложенные посты отсекаются по границе `visible_as_of()`, а не по
+        `timezone.now()`, чтобы запрос не менялся при каждом вызове.
+    :param add_annotations: Добавлять сортировку для лент. Количество
+        комментариев хранится в поле `Post.comment_count`.
+    :param projection: Профиль выборки из `POST_PROJECTIONS`: загружаются
+        только нужные странице столбцы. По умолчанию — все столбцы. В
+        публикации профиля категории и местоположения подставляет
+        `attach_lookups()`.
     :return: QuerySet[Post]
     """
-    queryset = Post.objects.select_related("author", "location", "category")
+    if projection is None:
+        queryset = Post.objects.select_related(
+            "author", "location", "category"
+        )
+    else:
+        profile = POST_PROJECTIONS[projection]
+        queryset = Post.objects.only(*profile["fields"])
+        if profile["related"]:
+            queryset = queryset.select_related(*profile["related"])
     if use_filters:
         queryset = queryset.filter(
             is_published=True,
-            pub_date__lte=timezone.now(),
-            category__is_published=True,
+            pub_date__lte=visible_as_of(),
+            category_id__in=published_category_ids(),
         )
     if add_annotations:
-        queryset = queryset.annotate(comment_count=Count("comments")).order_by(
-            "-pub_date"
-        )
+        queryset = queryset.order_by("-pub_date")
     return queryset
 
 
 def paginate_queryset(
-    queryset: QuerySet, request: HttpRequest, posts_limit: int = POSTS_LIMIT
-) -> QuerySet:
+    queryset: QuerySet,
+    request: HttpRequest,
+    posts_limit: int = POSTS_LIMIT,
+    use_cursor: Optional[bool] = None,
+    count_feed: Optional[str] = None,
+) -> Union[Page, CursorPage]:
     """
     Функция для пагинации списка записей.
 
+    В курсорном режиме страницы строятся по ключу `(pub_date, id)` без
+    подсчёта общего количества записей. Старые ссылки вида `?page=N`
+    продолжают обслуживаться обычным постраничным пагинатором.
+
+    Обычная страница получает `elided_page_range` — номера первых,
+    последних и соседних с текущей страниц с многоточием вместо
+    остальных, чтобы шаблон не перебирал все страницы ленты.
+
     :param queryset: QuerySet[Post] для пагинации.
     :param request: HTTP-запрос с параметрами.
     :param posts_limit: Лимит записей на страницу.
+    :param use_cursor: Включить курсорный режим; по умолчанию берётся
+        из настройки `BLOG_CURSOR_PAGINATION`.
+    :param count_feed: Имя ленты, чьё закешированное количество записей
+        заменяет `COUNT(*)` (см. `blog.counts`). `queryset` должен
+        совпадать с лентой. Если количество — оценка планировщика, у
+        страницы выставляется `count_is_estimated`.
     :return: объект страницы.
     """
+    if use_cursor is None:
+        use_cursor = getattr(settings, "BLOG_CURSOR_PAGINATION", False)
+    if use_cursor and "page" not in request.GET:
+        page = CursorPaginator(queryset, posts_limit).get_page(
+            request.GET.get("cursor")
+        )
+        attach_lookups(page)
+        return page
     paginator = Paginator(queryset, posts_limit)
-    page_number = request.GET.get("page")
-    return paginator.get_page(page_number)
+    estimated = False
+    if count_feed is not None:
+        paginator.count, estimated = feed_count(count_feed, queryset)
+    page = paginator.get_page(request.GET.get("page"))
+    page.object_list = list(page.object_list)
+    attach_lookups(page)
+    page.count_is_estimated = estimated
+    page.elided_page_range = list(
+        paginator.get_elided_page_range(
+            page.number,
+            on_each_side=PAGINATOR_ON_EACH_SIDE,
+            on_ends=PAGINATOR_ON_ENDS,
+        )
+    )
+    page.ellipsis = paginator.ELLIPSIS
+    return page
+
+
+def get_search_page(
+    query: str,
+    request: HttpRequest,
+    posts_limit: int = POSTS_LIMIT,
+) -> CursorPage:
+    """
+    Страница результатов поиска по видимым публикациям.
+
+    Видимость та же, что и в лентах. Результаты упорядочены по
+    релевантности, страницы строятся курсором по `(rank, id)`.
+    """
+    queryset = search_posts(
+        get_post_queryset(use_filters=True, projection="feed"), query
+    )
+    page = CursorPaginator(
+        queryset, posts_limit, key="rank", descending=False, key_type=float
+    ).get_page(request.GET.get("cursor"))
+    attach_lookups(page)
+    return page
+
+
+def get_comments_page(
+    post: Post,
+    cursor: Optional[str] = None,
+    comments_limit: int = COMMENTS_LIMIT,
+) -> CursorPage:
+    """
+    Страница комментариев публикации, от старых к новым.
+
+    Страницы строятся курсором по `(created_at, id)` и индексу
+    `comment_post_created_at_idx`.
+    """
+    queryset = Comment.objects.filter(post=post).select_related("author")
+    return CursorPaginator(
+        queryset, comments_limit, key="created_at", descending=False
+    ).get_page(cursor)
+
+
+def get_post_views(post: Post) -> int:
+    """
+    Количество просмотров публикации.
+
+    К записанному `Post.view_count` добавляются пачки, ждущие сброса
+    (один запрос по индексу), и буфер текущего процесса. Буферы других
+    процессов не видны, пока они не записаны в пачки.
+    """
+    return (
+        post.view_count
+        + stored_views([post.pk])[post.pk]
+        + pending_views([post.pk])[post.pk]
+    )
+
+
+def get_ranked_posts(
+    ranking: str, limit: int = RANKED_FEED_LIMIT
+) -> List[Post]:
+    """
+    Первые `limit` видимых публикаций по рейтингу.
+
+    Запрос читает индекс рейтинга `PostRanking` сверху вниз и не
+    сортирует все публикации.
+
+    :param ranking: Название рейтинга из `blog.ranking.RANKINGS`.
+    """
+    if ranking not in RANKINGS:
+        raise ValueError(f"Неизвестный рейтинг: {ranking}")
+    posts = list(
+        get_post_queryset(use_filters=True, projection="feed")
+        .filter(ranking__isnull=False)
+        .order_by(f"-ranking__{ranking}_score")[:limit]
+    )
+    attach_lookups(posts)
+    return posts
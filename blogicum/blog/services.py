@@ -0,0 +1,149 @@
+from contextvars import ContextVar
+from typing import FrozenSet, Iterable, List, Tuple
+
+from django.db import router, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from blog.cache import invalidate_feeds, post_feeds
+from blog.constants import EXCERPT_MAX_LENGTH, EXCERPT_WORDS
+from blog.models import Comment, Post
+
+_bulk_comment_delete: ContextVar[bool] = ContextVar(
+    "bulk_comment_delete", default=False
+)
+_deleting_posts: ContextVar[FrozenSet[int]] = ContextVar(
+    "deleting_posts", default=frozenset()
+)
+
+
+def change_comment_count(post_id: int, delta: int) -> None:
+    """
+    Атомарно изменяет счётчик комментариев публикации на `delta`.
+
+    Время изменения публикации тоже обновляется: комментарии — часть её
+    страницы.
+
+    :param post_id: Идентификатор публикации.
+    :param delta: Величина изменения (может быть отрицательной).
+    """
+    Post.objects.filter(pk=post_id).update(
+        comment_count=Greatest(F("comment_count") + delta, 0),
+        updated_at=timezone.now(),
+    )
+
+
+def touch_post(post_id: int) -> None:
+    """Обновляет время изменения публикации без вызова сигналов."""
+    Post.objects.filter(pk=post_id).update(updated_at=timezone.now())
+
+
+def _counted_comments():
+    counts = (
+        Comment.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def rebuild_comment_counts() -> int:
+    """
+    Пересчитывает счётчики комментариев всех публикаций по таблице
+    комментариев.
+
+    :return: Количество обновлённых публикаций.
+    """
+    return Post.objects.update(comment_count=_counted_comments())
+
+
+def in_bulk_comment_delete() -> bool:
+    """
+    Идёт ли в текущем контексте `delete_comments()`.
+
+    Обработчики удаления отдельного комментария в это время ничего не
+    делают: счётчики и ленты обновляет сама `delete_comments()`.
+    """
+    return _bulk_comment_delete.get()
+
+
+def begin_post_delete(post_id: int) -> None:
+    """Отмечает, что публикация удаляется вместе с комментариями."""
+    _deleting_posts.set(_deleting_posts.get() | {post_id})
+
+
+def end_post_delete(post_id: int) -> None:
+    _deleting_posts.set(_deleting_posts.get() - {post_id})
+
+
+def in_post_delete(post_id: int) -> bool:
+    """
+    Удаляется ли публикация `post_id` в текущем контексте.
+
+    Её комментарии удаляются каскадом, и обработчики удаления отдельного
+    комментария для них ничего не делают: счётчик и ленты публикации
+    обновит удаление её самой.
+    """
+    return post_id in _deleting_posts.get()
+
+
+def delete_comments(comment_ids: Iterable[int]) -> int:
+    """
+    Удаляет комментарии через `QuerySet.delete()` без работы обработчиков
+    сигналов для каждого из них.
+
+    Счётчики затронутых публикаций пересчитываются по таблице одним
+    `UPDATE`, ленты с этими публикациями сбрасываются один раз.
+
+    :param comment_ids: Идентификаторы удаляемых комментариев.
+    :return: Количество удалённых комментариев.
+    """
+    using = router.db_for_write(Comment)
+    comments = Comment.objects.using(using).filter(pk__in=list(comment_ids))
+    with transaction.atomic(using=using):
+        post_ids = set(comments.values_list("post_id", flat=True))
+        if not post_ids:
+            return 0
+        token = _bulk_comment_delete.set(True)
+        try:
+            deleted, _ = comments.delete()
+        finally:
+            _bulk_comment_delete.reset(token)
+        Post.objects.using(using).filter(pk__in=post_ids).update(
+            comment_count=_counted_comments(),
+            updated_at=timezone.now(),
+        )
+    invalidate_feeds(post_feeds(post_ids, only_visible=True))
+    return deleted
+
+
+def store_renditions(post: Post, renditions: List[Tuple[int, int]]) -> None:
+    """
+    Сохраняет в публикации копии её изображения и сбрасывает ленты с ней.
+
+    :param renditions: Результат `blog.images.generate_renditions()`.
+    """
+    post.image_renditions = {
+        "name": post.image.name,
+        "widths": [list(pair) for pair in renditions],
+    }
+    Post.objects.filter(pk=post.pk, image=post.image.name).update(
+        image_renditions=post.image_renditions,
+        updated_at=timezone.now(),
+    )
+    invalidate_feeds(post_feeds([post.pk]))
+
+
+def make_excerpt(text: str) -> str:
+    """
+    Начало текста публикации для карточки в лентах.
+
+    Совпадает с `{{ text|truncatewords:EXCERPT_WORDS }}`, но не длиннее
+    `EXCERPT_MAX_LENGTH` символов.
+    """
+    excerpt = Truncator(text).words(EXCERPT_WORDS, truncate=" …")
+    return Truncator(excerpt).chars(EXCERPT_MAX_LENGTH)
@@ -0,0 +1,240 @@
+from collections import Counter
+
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog.cache import (
+    ALL_FEEDS,
+    invalidate_feeds,
+    post_feeds,
+    profile_feed,
+)
+from blog.counts import adjust_feed_counts, counted_feeds, reset_feed_counts
+from blog.lookups import invalidate_lookups
+from blog.models import Category, Comment, Location, Post, User
+from blog.publication import refresh_publication_schedule, visible_as_of
+from blog.search import index_posts, unindex_post
+from blog.services import (
+    begin_post_delete,
+    change_comment_count,
+    end_post_delete,
+    in_bulk_comment_delete,
+    in_post_delete,
+    make_excerpt,
+    touch_post,
+)
+from blog.tasks import (
+    process_post_image,
+    publish_scheduled_post,
+)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance: Comment, **kwargs):
+    """Запоминает прежнюю публикацию комментария перед его изменением."""
+    instance._previous_post_id = None
+    if instance.pk is not None:
+        instance._previous_post_id = (
+            Comment.objects.filter(pk=instance.pk)
+            .values_list("post_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance: Comment, created: bool, **kwargs):
+    """
+    Учитывает новый или перенесённый комментарий в счётчике публикации,
+    а при редактировании обновляет время изменения публикации.
+    """
+    previous_post_id = getattr(instance, "_previous_post_id", None)
+    if created:
+        change_comment_count(instance.post_id, 1)
+    elif previous_post_id and previous_post_id != instance.post_id:
+        change_comment_count(previous_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+    else:
+        touch_post(instance.post_id)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance: Comment, **kwargs):
+    """Уменьшает счётчик при удалении комментария, в том числе каскадном."""
+    if not in_bulk_comment_delete() and not in_post_delete(instance.post_id):
+        change_comment_count(instance.post_id, -1)
+
+
+@receiver(pre_delete, sender=Post)
+def mark_post_delete(sender, instance: Post, **kwargs):
+    """Отключает обработчики удаления комментариев публикации."""
+    begin_post_delete(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def unmark_post_delete(sender, instance: Post, **kwargs):
+    end_post_delete(instance.pk)
+
+
+@receiver(pre_save, sender=Post)
+def fill_post_excerpt(sender, instance: Post, **kwargs):
+    """Обновляет начало текста, которое выводится в лентах."""
+    if "text" not in instance.get_deferred_fields():
+        instance.excerpt = make_excerpt(instance.text)
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+def remember_post_feeds(sender, instance: Post, **kwargs):
+    """Запоминает ленты, в которых публикация была до изменения."""
+    instance._previous_feeds = (
+        post_feeds([instance.pk]) if instance.pk is not None else set()
+    )
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post_feeds(sender, instance: Post, **kwargs):
+    """Сбрасывает ленты, где публикация была и где она оказалась."""
+    previous_feeds = getattr(instance, "_previous_feeds", set())
+    invalidate_feeds(previous_feeds | post_feeds([instance.pk]))
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+def remember_counted_feeds(sender, instance: Post, **kwargs):
+    """Запоминает ленты со счётчиками, где публикация видна сейчас."""
+    instance._count_boundary = visible_as_of()
+    instance._previous_counted = (
+        counted_feeds([instance.pk], instance._count_boundary)
+        if instance.pk is not None
+        else Counter()
+    )
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance: Post, **kwargs):
+    """
+    Поправляет счётчики лент, если публикация появилась в ленте или
+    пропала из неё. Граница видимости та же, что до сохранения: вышедшие
+    за это время отложенные публикации учитывает сдвиг границы.
+    """
+    deltas = counted_feeds([instance.pk], instance._count_boundary)
+    deltas.subtract(instance._previous_counted)
+    adjust_feed_counts(deltas)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance: Post, **kwargs):
+    adjust_feed_counts(
+        Counter({feed: -n for feed, n in instance._previous_counted.items()})
+    )
+
+
+@receiver(post_save, sender=Post)
+def enqueue_post_processing(sender, instance: Post, **kwargs):
+    """
+    Ставит в очередь обработку изображения и выпуск отложенной публикации.
+
+    Задачи ставятся после фиксации транзакции: иначе обработчик мог бы
+    взять задачу раньше, чем увидит публикацию, а при откате задача
+    осталась бы без публикации.
+    """
+    post_id, has_image = instance.pk, bool(instance.image)
+    pub_date = instance.pub_date
+
+    def enqueue():
+        if has_image:
+            process_post_image.enqueue(post_id=post_id)
+        delay = (pub_date - timezone.now()).total_seconds()
+        if delay > 0:
+            publish_scheduled_post.enqueue(
+                delay=int(delay) + 1,
+                post_id=post_id,
+                pub_date=pub_date.isoformat(),
+            )
+
+    transaction.on_commit(enqueue)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def reschedule_publication(sender, instance: Post, **kwargs):
+    """Пересчитывает границу видимости и ближайшую отложенную публикацию."""
+    refresh_publication_schedule()
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance: Post, using: str, **kwargs):
+    """Обновляет публикацию в поисковом индексе."""
+    index_posts([instance], using=using)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance: Post, using: str, **kwargs):
+    unindex_post(instance.pk, using=using)
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_feeds(sender, instance: Post, **kwargs):
+    """Сбрасывает все ленты, где публикация была, включая рейтинги."""
+    invalidate_feeds(getattr(instance, "_previous_feeds", set()))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_feeds(sender, instance: Comment, **kwargs):
+    """Сбрасывает только ленты, где виден счётчик комментариев публикации."""
+    if in_bulk_comment_delete() or in_post_delete(instance.post_id):
+        return
+    post_ids = {instance.post_id, getattr(instance, "_previous_post_id", None)}
+    invalidate_feeds(post_feeds(post_ids - {None}, only_visible=True))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_all_feeds(sender, instance, **kwargs):
+    """
+    Категории и местоположения выводятся в карточках всех лент и влияют на
+    видимость публикаций, поэтому их изменение сбрасывает все ленты.
+    """
+    invalidate_feeds({ALL_FEEDS})
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_lookup_tables(sender, instance, **kwargs):
+    """Справочники перечитываются во всех процессах."""
+    invalidate_lookups()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reset_category_counts(sender, instance: Category, **kwargs):
+    """Публикация или снятие категории меняет состав многих лент."""
+    reset_feed_counts()
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_feeds(
+    sender, instance, created: bool, update_fields=None, **kwargs
+):
+    """Сбрасывает ленты при изменении профиля, но не при входе в систему."""
+    if created or update_fields and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_feeds({ALL_FEEDS})
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_author_feed(sender, instance, **kwargs):
+    """Профиль удалённого автора больше не отвечает 304 по старому ETag."""
+    invalidate_feeds({profile_feed(instance.username)})
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from blog.constants import RANKING_INTERVAL, VIEW_FLUSH_INTERVAL
+from blog.images import generate_renditions, strip_exif
+from blog.publication import refresh_publication_schedule
+from blog.models import Post
+from blog.ranking import update_rankings
+from blog.services import store_renditions
+from blog.views_counter import flush_views
+from core.tasks import task
+
+
+@task(max_attempts=5)
+def process_post_image(post_id: int) -> None:
+    """Очищает EXIF оригинала и создаёт уменьшенные копии изображения."""
+    post = Post.objects.filter(pk=post_id).only("id", "image").first()
+    if post is None or not post.image:
+        return
+    force = strip_exif(post.image)
+    store_renditions(post, generate_renditions(post.image, force=force))
+
+
+@task()
+def publish_scheduled_post(post_id: int, pub_date: str) -> None:
+    """
+    Выпускает отложенную публикацию в момент `pub_date`.
+
+    Граница видимости сдвигается, ленты с вышедшими записями сбрасываются.
+    Если дату публикации успели изменить, задача ничего не делает: для
+    новой даты поставлена своя.
+    """
+    if not Post.objects.filter(
+        pk=post_id, pub_date=datetime.fromisoformat(pub_date)
+    ).exists():
+        return
+    refresh_publication_schedule()
+
+
+@task(every=VIEW_FLUSH_INTERVAL)
+def flush_post_views() -> None:
+    """Записывает накопленные просмотры публикаций в базу."""
+    flush_views()
+
+
+@task(every=RANKING_INTERVAL)
+def update_post_rankings() -> None:
+    """Пересчитывает рейтинги лент «Популярное» и «Обсуждают сейчас»."""
+    update_rankings()
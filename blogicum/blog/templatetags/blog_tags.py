@@ -0,0 +1,70 @@
+from django import template
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
+
+from blog.cache import post_card_version
+from blog.constants import POST_CARD_CACHE_TIMEOUT
+from blog.images import get_renditions
+from blog.lookups import published_categories
+from blog.search import MATCH_END, MATCH_START
+
+register = template.Library()
+
+
+@register.inclusion_tag("includes/category_menu.html")
+def category_menu(current=None):
+    """Меню опубликованных категорий из справочника, без запросов к БД."""
+    return {"categories": published_categories(), "current": current}
+
+
+@register.filter
+def card_version(post) -> str:
+    """Версия закешированной карточки публикации."""
+    return post_card_version(post)
+
+
+@register.simple_tag
+def post_card_timeout() -> int:
+    return POST_CARD_CACHE_TIMEOUT
+
+
+@register.inclusion_tag("includes/post_image.html")
+def post_image(post, sizes: str = "(max-width: 640px) 100vw, 640px"):
+    """
+    Выводит изображение публикации с набором уменьшенных копий в `srcset`.
+
+    В `src` подставляется копия средней ширины, ссылка ведёт на оригинал.
+    Пока копий нет, выводится оригинал.
+    """
+    renditions = get_renditions(post.image, post.image_renditions)
+    return {
+        "image": post.image,
+        "src": renditions[len(renditions) // 2][0] if renditions else None,
+        "srcset": ", ".join(f"{url} {width}w" for url, width in renditions),
+        "sizes": sizes,
+    }
+
+
+@register.filter
+def highlight(snippet: str) -> SafeString:
+    """Экранирует фрагмент поиска и выделяет совпадения тегом `<mark>`."""
+    return mark_safe(
+        escape(snippet or "")
+        .replace(MATCH_START, "<mark>")
+        .replace(MATCH_END, "</mark>")
+    )
+
+
+@register.simple_tag(takes_context=True)
+def querystring(context, **params) -> str:
+    """
+    Строка запроса текущей страницы с заменёнными параметрами.
+
+    Параметр со значением None удаляется: `{% querystring cursor=None %}`.
+    """
+    query = context["request"].GET.copy()
+    for name, value in params.items():
+        query.pop(name, None)
+        if value is not None:
+            query[name] = value
+    return f"?{query.urlencode()}"
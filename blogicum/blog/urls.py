@@ -10,6 +10,11 @@ post_urls = [
     path("<int:post_id>/edit/", views.edit_post, name="edit_post"),
     path("<int:post_id>/delete/", views.delete_post, name="delete_post"),
     path("<int:post_id>/comment/", views.add_comment, name="add_comment"),
+    path(
+        "<int:post_id>/comments/",
+        views.post_comments,
+        name="post_comments",
+    ),
     path(
         "<int:post_id>/edit_comment/<int:comment_id>/",
         views.edit_comment,
@@ -24,12 +29,15 @@ post_urls = [
 
 urlpatterns = [
     path("", views.index, name="index"),
+    path("popular/", views.popular, name="popular"),
+    path("trending/", views.trending, name="trending"),
     path("posts/", include(post_urls)),
     path(
         "category/<slug:category_slug>/",
         views.category,
         name="category_posts",
     ),
+    path("search/", views.search, name="search"),
     path("edit-profile/", views.edit_profile, name="edit_profile"),
     path("profile/<str:username>/", views.detail_profile, name="profile"),
 ]
@@ -7,12 +7,44 @@ from django.http import (
     HttpResponse,
     Http404,
 )
-
+from django.views.decorators.http import condition
+
+from blog.cache import (
+    INDEX_FEED,
+    POPULAR_FEED,
+    TRENDING_FEED,
+    cache_anonymous_feed,
+    category_feed,
+    profile_feed,
+)
+from blog.conditional import (
+    category_validator,
+    etag,
+    index_validator,
+    last_modified,
+    post_detail_validator,
+    profile_validator,
+)
 from blog.forms import CommentForm, EditProfileForm, PostForm
-from blog.models import Category, Comment, Post, User
-from blog.selectors import get_post_queryset, paginate_queryset
+from blog.lookups import attach_lookups, get_published_category
+from blog.models import Comment, Post, User
+from blog.constants import SEARCH_QUERY_MAX_LENGTH
+from blog.selectors import (
+    get_comments_page,
+    get_post_queryset,
+    get_post_views,
+    get_ranked_posts,
+    get_search_page,
+    paginate_queryset,
+)
+from blog.views_counter import counts_post_view
 
 
+@cache_anonymous_feed(lambda: INDEX_FEED)
+@condition(
+    etag_func=etag(index_validator),
+    last_modified_func=last_modified(index_validator),
+)
 def index(request: HttpRequest) -> HttpResponse:
     """
     Главная страница блога.
@@ -30,33 +62,72 @@ def index(request: HttpRequest) -> HttpResponse:
     """
     template = "blog/index.html"
     page_obj = paginate_queryset(
-        queryset=get_post_queryset(use_filters=True, add_annotations=True),
+        queryset=get_post_queryset(
+            use_filters=True, add_annotations=True, projection="feed"
+        ),
         request=request,
+        count_feed=INDEX_FEED,
     )
     return render(
         request=request, template_name=template, context={"page_obj": page_obj}
     )
 
 
-def post_detail(request: HttpRequest, post_id: int) -> HttpResponse:
+def _ranked_feed(
+    request: HttpRequest, ranking: str, title: str
+) -> HttpResponse:
+    return render(
+        request=request,
+        template_name="blog/ranked.html",
+        context={"posts": get_ranked_posts(ranking), "title": title},
+    )
+
+
+@cache_anonymous_feed(lambda: POPULAR_FEED)
+def popular(request: HttpRequest) -> HttpResponse:
     """
-    Детальная страница публикации.
+    Самые популярные публикации.
 
-    Отображает информацию о конкретной публикации, которая опубликована,
-    имеет дату публикации в прошлом или настоящем,
-    и относится к опубликованной категории.
+    Рейтинг учитывает просмотры и комментарии и медленно затухает со
+    временем; его пересчитывает фоновая задача.
 
     Аргументы:
         request: HttpRequest.
-        post_id: Идентификатор публикации.
 
     Возвращает:
-        HTTP-ответ с деталями публикации.
+        HttpResponse.
+    """
+    return _ranked_feed(request, "popular", "Популярное")
+
+
+@cache_anonymous_feed(lambda: TRENDING_FEED)
+def trending(request: HttpRequest) -> HttpResponse:
+    """
+    Публикации, которые читают и обсуждают сейчас.
+
+    Тот же рейтинг, что у популярных, но затухает за часы.
+
+    Аргументы:
+        request: HttpRequest.
+
+    Возвращает:
+        HttpResponse.
+    """
+    return _ranked_feed(request, "trending", "Обсуждают сейчас")
+
+
+def _get_visible_post(
+    request: HttpRequest, post_id: int, projection: str = "detail"
+) -> Post:
+    """
+    Публикация, которую может видеть пользователь: опубликованная, в
+    опубликованной категории и с наступившей датой, либо своя.
     """
     post = get_object_or_404(
-        get_post_queryset(),
+        get_post_queryset(projection=projection),
         pk=post_id,
     )
+    attach_lookups([post])
 
     if post.author != request.user and (
         not post.is_published
@@ -64,7 +135,30 @@ def post_detail(request: HttpRequest, post_id: int) -> HttpResponse:
         or post.pub_date > timezone.now()
     ):
         raise Http404("Публикация недоступна.")
+    return post
+
+
+@counts_post_view
+@condition(
+    etag_func=etag(post_detail_validator),
+    last_modified_func=last_modified(post_detail_validator),
+)
+def post_detail(request: HttpRequest, post_id: int) -> HttpResponse:
+    """
+    Детальная страница публикации.
+
+    Отображает информацию о конкретной публикации, которая опубликована,
+    имеет дату публикации в прошлом или настоящем,
+    и относится к опубликованной категории.
+
+    Аргументы:
+        request: HttpRequest.
+        post_id: Идентификатор публикации.
 
+    Возвращает:
+        HTTP-ответ с деталями публикации.
+    """
+    post = _get_visible_post(request, post_id)
     form = CommentForm()
     template = "blog/detail.html"
     return render(
@@ -73,11 +167,45 @@ def post_detail(request: HttpRequest, post_id: int) -> HttpResponse:
         context={
             "post": post,
             "form": form,
-            "comments": post.comments.all().select_related("author"),
+            "comments": get_comments_page(post),
+            "views": get_post_views(post),
+        },
+    )
+
+
+@condition(
+    etag_func=etag(post_detail_validator),
+    last_modified_func=last_modified(post_detail_validator),
+)
+def post_comments(request: HttpRequest, post_id: int) -> HttpResponse:
+    """
+    Фрагмент со следующей страницей комментариев публикации.
+
+    Подгружается со страницы публикации по ссылке «Показать ещё».
+
+    Аргументы:
+        request: HttpRequest, курсор страницы в параметре `cursor`.
+        post_id: Идентификатор публикации.
+
+    Возвращает:
+        HttpResponse с HTML-фрагментом.
+    """
+    post = _get_visible_post(request, post_id, projection="feed")
+    return render(
+        request=request,
+        template_name="includes/comment_list.html",
+        context={
+            "post": post,
+            "comments": get_comments_page(post, request.GET.get("cursor")),
         },
     )
 
 
+@cache_anonymous_feed(category_feed)
+@condition(
+    etag_func=etag(category_validator),
+    last_modified_func=last_modified(category_validator),
+)
 def category(request: HttpRequest, category_slug: str) -> HttpResponse:
     """
     Страница категории блога.
@@ -94,17 +222,17 @@ def category(request: HttpRequest, category_slug: str) -> HttpResponse:
         HttpResponse.
     """
     template = "blog/category.html"
-    category = get_object_or_404(
-        Category,
-        slug=category_slug,
-        is_published=True,
-    )
+    category = get_published_category(category_slug)
+    if category is None:
+        raise Http404("Категория не найдена.")
     page_obj = paginate_queryset(
         queryset=get_post_queryset(
             use_filters=True,
             add_annotations=True,
+            projection="feed",
         ).filter(category=category),
         request=request,
+        count_feed=category_feed(category_slug),
     )
     return render(
         request=request,
@@ -113,6 +241,11 @@ def category(request: HttpRequest, category_slug: str) -> HttpResponse:
     )
 
 
+@cache_anonymous_feed(profile_feed)
+@condition(
+    etag_func=etag(profile_validator),
+    last_modified_func=last_modified(profile_validator),
+)
 def detail_profile(request: HttpRequest, username: str) -> HttpResponse:
     """
     Отображает страницу профиля пользователя с его постами.
@@ -128,19 +261,48 @@ def detail_profile(request: HttpRequest, username: str) -> HttpResponse:
     """
     user = get_object_or_404(User, username=username)
     if request.user == user:
-        post_queryset = get_post_queryset(add_annotations=True)
+        post_queryset = get_post_queryset(
+            add_annotations=True, projection="profile"
+        )
     else:
         post_queryset = get_post_queryset(
             use_filters=True,
             add_annotations=True,
+            projection="profile",
         )
     page_obj = paginate_queryset(
         queryset=post_queryset.filter(author=user), request=request
     )
+    # Профиль выборки `profile` не присоединяет автора: это владелец.
+    for post in page_obj:
+        post.author = user
     context = {"profile": user, "page_obj": page_obj}
     return render(request, "blog/profile.html", context=context)
 
 
+def search(request: HttpRequest) -> HttpResponse:
+    """
+    Полнотекстовый поиск по опубликованным публикациям.
+
+    Аргументы:
+        request: HttpRequest, строка поиска в параметре `q`.
+
+    Возвращает:
+        HttpResponse.
+    """
+    query = request.GET.get("q", "").strip()[:SEARCH_QUERY_MAX_LENGTH]
+    page_obj = get_search_page(query, request) if query else None
+    return render(
+        request=request,
+        template_name="blog/search.html",
+        context={
+            "query": query,
+            "page_obj": page_obj,
+            "max_length": SEARCH_QUERY_MAX_LENGTH,
+        },
+    )
+
+
 @login_required
 def edit_profile(request: HttpRequest) -> HttpResponse:
     """
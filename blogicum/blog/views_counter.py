@@ -0,0 +1,175 @@
+"""
+Счётчик просмотров публикаций без UPDATE на каждый просмотр.
+
+Просмотры копятся в буфере процесса и раз в `VIEW_BUFFER_SECONDS` секунд
+(или по достижении `VIEW_BUFFER_SIZE` просмотров) записываются одним
+INSERT в таблицу пачек `PostViewBatch`. Периодическая задача
+`blog.tasks.flush_post_views` суммирует пачки и записывает их в
+`Post.view_count` одним UPDATE.
+
+Таблица пачек общая для всех веб-процессов и обработчиков задач. Пачки
+удаляются в той же транзакции, в которой записываются просмотры, поэтому
+ни одна пачка не учитывается дважды и не теряется после записи.
+"""
+import atexit
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from http import HTTPStatus
+from typing import Dict, Iterable
+
+from django.db import transaction
+from django.db.models import Case, F, BigIntegerField, Sum, Value, When
+
+from blog.constants import VIEW_BUFFER_SECONDS, VIEW_BUFFER_SIZE
+from blog.models import Post, PostViewBatch
+
+FLUSH_CHUNK_SIZE = 500
+FLUSH_BATCH_ROWS = 5000
+
+
+class _ConcurrentFlush(Exception):
+    """Часть пачек уже забрал другой сброс."""
+
+
+_lock = threading.Lock()
+_buffer: Counter = Counter()
+_spilled_at = time.monotonic()
+
+
+def record_view(post_id: int) -> None:
+    """Учитывает просмотр публикации в буфере процесса."""
+    global _spilled_at
+    with _lock:
+        _buffer[post_id] += 1
+        if (
+            sum(_buffer.values()) < VIEW_BUFFER_SIZE
+            and time.monotonic() - _spilled_at < VIEW_BUFFER_SECONDS
+        ):
+            return
+        batch = dict(_buffer)
+        _buffer.clear()
+        _spilled_at = time.monotonic()
+    _store_batch(batch)
+
+
+def counts_post_view(view):
+    """
+    Учитывает просмотр публикации `post_id` после ответа представления.
+
+    Декоратор ставится снаружи `@condition`: повторный визит браузера с
+    `If-None-Match` получает 304 без вызова представления, но это тоже
+    просмотр.
+    """
+
+    @wraps(view)
+    def wrapper(request, post_id: int, *args, **kwargs):
+        response = view(request, post_id, *args, **kwargs)
+        if request.method == "GET" and response.status_code in (
+            HTTPStatus.OK,
+            HTTPStatus.NOT_MODIFIED,
+        ):
+            record_view(post_id)
+        return response
+
+    return wrapper
+
+
+def spill_views() -> None:
+    """Записывает буфер процесса в таблицу пачек, не дожидаясь порога."""
+    global _spilled_at
+    with _lock:
+        batch = dict(_buffer)
+        _buffer.clear()
+        _spilled_at = time.monotonic()
+    if batch:
+        _store_batch(batch)
+
+
+def _store_batch(batch: Dict[int, int]) -> None:
+    PostViewBatch.objects.bulk_create(
+        PostViewBatch(post_id=post_id, views=views)
+        for post_id, views in batch.items()
+    )
+
+
+def _add_views(views: Counter) -> None:
+    post_ids = list(views)
+    for start in range(0, len(post_ids), FLUSH_CHUNK_SIZE):
+        chunk = post_ids[start:start + FLUSH_CHUNK_SIZE]
+        Post.objects.filter(pk__in=chunk).update(
+            view_count=F("view_count")
+            + Case(
+                *(When(pk=pk, then=Value(views[pk])) for pk in chunk),
+                default=Value(0),
+                output_field=BigIntegerField(),
+            )
+        )
+
+
+def _flush_rows(limit: int) -> int:
+    with transaction.atomic():
+        rows = list(
+            PostViewBatch.objects.order_by("pk").values_list(
+                "pk", "post_id", "views"
+            )[:limit]
+        )
+        if not rows:
+            return 0
+        # Удаление раньше записи: параллельный сброс, прочитавший те же
+        # пачки, удалит меньше строк и откатится, ничего не записав.
+        deleted, _ = PostViewBatch.objects.filter(
+            pk__in=[pk for pk, _, _ in rows]
+        ).delete()
+        if deleted != len(rows):
+            raise _ConcurrentFlush
+        views = Counter()
+        for _, post_id, count in rows:
+            views[post_id] += count
+        _add_views(views)
+        return sum(views.values())
+
+
+def flush_views(batch_rows: int = FLUSH_BATCH_ROWS) -> int:
+    """
+    Записывает накопленные пачки просмотров в `Post.view_count`.
+
+    Пачки обрабатываются порциями по `batch_rows` строк, каждая в своей
+    транзакции. Если пачки одновременно забрал другой сброс, этот
+    завершается.
+
+    :return: Количество записанных просмотров.
+    """
+    flushed = 0
+    while True:
+        try:
+            written = _flush_rows(batch_rows)
+        except _ConcurrentFlush:
+            break
+        if not written:
+            break
+        flushed += written
+    return flushed
+
+
+def stored_views(post_ids: Iterable[int]) -> Counter:
+    """Просмотры из таблицы пачек, ещё не записанные в публикации."""
+    return Counter(
+        dict(
+            PostViewBatch.objects.filter(post_id__in=list(post_ids))
+            .order_by()
+            .values("post_id")
+            .annotate(total=Sum("views"))
+            .values_list("post_id", "total")
+        )
+    )
+
+
+def pending_views(post_ids: Iterable[int]) -> Counter:
+    """Просмотры из буфера процесса, ещё не попавшие в таблицу пачек."""
+    with _lock:
+        return Counter({pk: _buffer[pk] for pk in post_ids if pk in _buffer})
+
+
+atexit.register(spill_views)
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -22,9 +23,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.ServerTimingMiddleware",
+    "core.middleware.RepeatedQueriesMiddleware",
+    "core.middleware.ReadReplicaMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -51,12 +56,119 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "blogicum.wsgi.application"
 
-DATABASES = {
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "core.backends.postgresql",
+            "NAME": os.getenv("POSTGRES_DB", "blogicum"),
+            "USER": os.getenv("POSTGRES_USER", "blogicum"),
+            "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", "localhost"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            # Подключения переиспользует пул, Django закрывает их после
+            # каждого запроса.
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {
+                "pool": {
+                    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                    "max_lifetime": float(
+                        os.getenv("DB_POOL_MAX_LIFETIME", "1800")
+                    ),
+                    "timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+                    "check_idle": float(os.getenv("DB_POOL_CHECK_IDLE", "5")),
+                },
+            },
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        }
+    }
+
+# Реплика для чтения: SQLITE_REPLICA_PATH для SQLite, DB_REPLICA_HOST для
+# PostgreSQL (остальные параметры берутся у основной базы).
+if os.getenv("SQLITE_REPLICA_PATH") and DB_ENGINE != "postgresql":
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("SQLITE_REPLICA_PATH"),
+    }
+elif os.getenv("DB_REPLICA_HOST") and DB_ENGINE == "postgresql":
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("DB_REPLICA_HOST"),
+        "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+
+# Страницы только для чтения, которые можно отдавать из реплики.
+REPLICA_VIEWS = {
+    "blog:index",
+    "blog:popular",
+    "blog:trending",
+    "blog:category_posts",
+    "blog:profile",
+    "blog:post_detail",
+    "blog:post_comments",
+    "blog:search",
+}
+
+# Сколько секунд после изменения пользователь читает из основной базы.
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "10"))
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -20000,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
+
+# Кеш должен быть общим для всех процессов: веб-процессов и `runworker`.
+# В нём версии лент и справочников, счётчики лент и граница публикации.
+# CACHE_BACKEND: file — каталог на диске, общий для процессов одной машины
+# (по умолчанию); memcached — сервер CACHE_LOCATION (пакет pymemcache);
+# database — таблица CACHE_LOCATION (`manage.py createcachetable`);
+# locmem — память одного процесса, только для однопроцессного запуска.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")
+CACHE_BACKENDS = {
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        str(BASE_DIR / "django_cache"),
+    ),
+    "memcached": (
+        "django.core.cache.backends.memcached.PyMemcacheCache",
+        "127.0.0.1:11211",
+    ),
+    "database": (
+        "django.core.cache.backends.db.DatabaseCache",
+        "django_cache",
+    ),
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", ""),
+}
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND][0],
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION", CACHE_BACKENDS[CACHE_BACKEND][1]
+        ),
     }
 }
+if CACHE_BACKEND != "memcached":
+    # Версии лент хранятся без таймаута: при 300 записях по умолчанию их
+    # вытесняли бы страницы и карточки.
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "10000")),
+    }
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -104,3 +216,22 @@ MEDIA_URL = "media/"
 TEMPLATES_DIR = BASE_DIR / "templates"
 
 LOGIN_URL = "login"
+
+BLOG_CURSOR_PAGINATION = False
+
+# Доля запросов с заголовком Server-Timing и записью в журнал core.timing.
+# Заголовок раскрывает внутренние замеры, поэтому по умолчанию выключен.
+SERVER_TIMING_SAMPLE_RATE = float(os.getenv("SERVER_TIMING_SAMPLE_RATE", "0"))
+
+QUERY_REPEAT_LIMIT = 20
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core": {"handlers": ["console"], "level": "INFO"},
+    },
+}
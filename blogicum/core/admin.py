@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "status",
+        "attempts",
+        "run_after",
+        "created_at",
+        "finished_at",
+        "runtime_ms",
+    )
+    list_filter = ("status", "name")
+    readonly_fields = ("locked_by", "locked_until", "last_error")
+
+
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,94 @@
+"""
+PostgreSQL с пулом подключений внутри процесса.
+
+Подключается как `ENGINE = "core.backends.postgresql"`; параметры пула
+задаются в `OPTIONS["pool"]` и передаются в `core.pool.ConnectionPool`.
+Закрытие подключения Django возвращает его в пул, поэтому
+`CONN_MAX_AGE` с этим бэкендом оставляют равным 0.
+"""
+import os
+import threading
+from typing import Dict, Tuple
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.extras
+from django.db.backends.postgresql import base, creation
+from django.utils.asyncio import async_unsafe
+
+from core.pool import ConnectionPool
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _check(connection) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def _reset(connection) -> None:
+    if connection.closed:
+        raise psycopg2.InterfaceError("Подключение закрыто.")
+    status = connection.get_transaction_status()
+    if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+
+def close_pools(alias: str) -> None:
+    """Закрывает простаивающие подключения всех пулов псевдонима БД."""
+    with _pools_lock:
+        for key in [key for key in _pools if key[0] == alias]:
+            _pools.pop(key).closeall()
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Простаивающие подключения помешали бы DROP DATABASE.
+        close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def _get_pool(self, conn_params) -> ConnectionPool:
+        # Пул не наследуется дочерними процессами, а смена NAME (тестовая
+        # база) даёт отдельный пул.
+        key = (self.alias, os.getpid(), repr(sorted(conn_params.items())))
+        with _pools_lock:
+            if key not in _pools:
+                options = dict(self.settings_dict["OPTIONS"].get("pool", {}))
+                _pools[key] = ConnectionPool(
+                    lambda: psycopg2.connect(**conn_params),
+                    check=_check,
+                    reset=_reset,
+                    **options,
+                )
+            return _pools[key]
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        connection = self._get_pool(conn_params).getconn()
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = options.get(
+            "isolation_level", connection.isolation_level
+        )
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = self._get_pool(self.get_connection_params())
+        with self.wrap_database_errors:
+            pool.putconn(self.connection, discard=self.connection.closed)
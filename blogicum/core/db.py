@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def apply_sqlite_pragmas(cursor, pragmas: dict) -> None:
+    """Выполняет `PRAGMA name = value` для каждой пары из `pragmas`."""
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def configure_sqlite(sender, connection, **kwargs) -> None:
+    """
+    Настраивает новое подключение к SQLite.
+
+    WAL позволяет читать во время записи комментария, `busy_timeout`
+    заставляет писателя ждать блокировку, а не падать с
+    `database is locked`. Набор PRAGMA задаётся настройкой `SQLITE_PRAGMAS`.
+    """
+    if connection.vendor != "sqlite":
+        return
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    with connection.cursor() as cursor:
+        apply_sqlite_pragmas(cursor, pragmas)
+
+
+def connect_signals() -> None:
+    connection_created.connect(
+        configure_sqlite, dispatch_uid="core.db.configure_sqlite"
+    )
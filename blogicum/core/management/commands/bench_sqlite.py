@@ -0,0 +1,183 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.db import apply_sqlite_pragmas
+
+SCHEMA = """
+CREATE TABLE post (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    pub_date REAL NOT NULL,
+    comment_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX post_pub_date_idx ON post (pub_date DESC);
+CREATE TABLE comment (
+    id INTEGER PRIMARY KEY,
+    post_id INTEGER NOT NULL REFERENCES post (id),
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX comment_post_idx ON comment (post_id);
+"""
+
+FEED_QUERY = (
+    "SELECT id, title, text, pub_date, comment_count FROM post "
+    "ORDER BY pub_date DESC LIMIT 10 OFFSET ?"
+)
+
+
+def _seed(path: str, posts: int) -> None:
+    with sqlite3.connect(path) as db:
+        db.executescript(SCHEMA)
+        db.executemany(
+            "INSERT INTO post (title, text, pub_date) VALUES (?, ?, ?)",
+            (
+                (f"Публикация {i}", "Текст публикации. " * 40, i)
+                for i in range(posts)
+            ),
+        )
+    db.close()
+
+
+class _Profile:
+    """Режим подключения: как в Django по умолчанию или с настройками."""
+
+    def __init__(self, path: str, tuned: bool):
+        self.path = path
+        self.tuned = tuned
+        self._local = threading.local()
+
+    def connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, isolation_level=None)
+        if self.tuned:
+            apply_sqlite_pragmas(db.cursor(), settings.SQLITE_PRAGMAS)
+        return db
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Без настроек подключение открывается на каждую операцию, как при
+        `CONN_MAX_AGE = 0`.
+        """
+        if not self.tuned:
+            return self.connect()
+        if not hasattr(self._local, "db"):
+            self._local.db = self.connect()
+        return self._local.db
+
+    def release(self, db: sqlite3.Connection) -> None:
+        if not self.tuned:
+            db.close()
+
+
+def _read(profile: _Profile, deadline: float, count, number: int):
+    offset = 0
+    while time.monotonic() < deadline:
+        db = profile.connection()
+        try:
+            db.execute(FEED_QUERY, (offset,)).fetchall()
+            count("reads")
+        except sqlite3.OperationalError:
+            count("errors")
+        finally:
+            profile.release(db)
+        offset = (offset + 10 * (number + 1)) % 1000
+
+
+def _write(profile: _Profile, deadline: float, count, number: int):
+    """Добавляет комментарий и обновляет счётчик, как сигналы блога."""
+    post_id = number + 1
+    while time.monotonic() < deadline:
+        db = profile.connection()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "INSERT INTO comment (post_id, text, created_at) "
+                "VALUES (?, ?, ?)",
+                (post_id, "Комментарий", time.time()),
+            )
+            db.execute(
+                "UPDATE post SET comment_count = comment_count + 1 "
+                "WHERE id = ?",
+                (post_id,),
+            )
+            db.execute("COMMIT")
+            count("writes")
+        except sqlite3.OperationalError:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            count("errors")
+        finally:
+            profile.release(db)
+
+
+def _run(profile: _Profile, readers: int, writers: int, seconds: float):
+    counters = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def count(name):
+        with lock:
+            counters[name] += 1
+
+    threads = [
+        threading.Thread(target=_read, args=(profile, deadline, count, i))
+        for i in range(readers)
+    ] + [
+        threading.Thread(target=_write, args=(profile, deadline, count, i))
+        for i in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает пропускную способность SQLite при одновременных чтении "
+        "и записи: настройки по умолчанию против SQLITE_PRAGMAS и "
+        "постоянных подключений."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=5.0,
+            help="Длительность каждого прогона.",
+        )
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=5000,
+            help="Количество публикаций в тестовой базе.",
+        )
+
+    def handle(self, *args, **options):
+        for tuned in (False, True):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "bench.sqlite3")
+                _seed(path, options["posts"])
+                result = _run(
+                    _Profile(path, tuned),
+                    options["readers"],
+                    options["writers"],
+                    options["seconds"],
+                )
+            seconds = options["seconds"]
+            self.stdout.write(
+                f"{'настроенный' if tuned else 'по умолчанию':>13}: "
+                f"чтений {result['reads'] / seconds:>8.0f}/с, "
+                f"записей {result['writes'] / seconds:>7.0f}/с, "
+                f"ошибок блокировки {result['errors']}"
+            )
@@ -0,0 +1,105 @@
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.tasks import (
+    VISIBILITY_TIMEOUT,
+    claim_jobs,
+    execute_job,
+    run_pending_jobs,
+    schedule_periodic_tasks,
+    task_metrics,
+)
+
+
+def _init_worker_process():
+    """Готовит дочерний процесс: Django и собственные подключения к БД."""
+    django.setup()
+    connections.close_all()
+
+
+def _execute_in_child(job_id: int, token: str) -> str:
+    try:
+        return execute_job(job_id, token)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Запускает обработчик фоновых задач из очереди в базе данных."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=2,
+            help="Размер пула процессов; 0 — выполнять в текущем процессе.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Пауза между опросами пустой очереди, в секундах.",
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            type=int,
+            default=VISIBILITY_TIMEOUT,
+            help="Через сколько секунд незавершённая задача снова доступна.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Обработать готовые задачи и завершиться.",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Вывести метрики очереди и завершиться.",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.stdout.write(
+                json.dumps(task_metrics(), default=str, indent=2)
+            )
+            return
+        schedule_periodic_tasks()
+        if options["processes"] < 1:
+            self._run_inline(options)
+            return
+
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=options["processes"],
+            initializer=_init_worker_process,
+        ) as pool:
+            while True:
+                jobs = claim_jobs(
+                    options["processes"], options["visibility_timeout"]
+                )
+                if jobs:
+                    wait(
+                        [
+                            pool.submit(
+                                _execute_in_child, job.pk, job.locked_by
+                            )
+                            for job in jobs
+                        ]
+                    )
+                elif options["once"]:
+                    break
+                else:
+                    time.sleep(options["poll_interval"])
+
+    def _run_inline(self, options):
+        while True:
+            processed = run_pending_jobs()
+            if options["once"] and not processed:
+                break
+            if not processed:
+                time.sleep(options["poll_interval"])
@@ -0,0 +1,258 @@
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.template.backends.django import Template
+
+from core.routers import reset_read_database, use_read_database
+
+logger = logging.getLogger("core.timing")
+queries_logger = logging.getLogger("core.queries")
+
+_IN_LIST_RE = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+_SAVEPOINT_RE = re.compile(r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO)")
+
+_current_timing: ContextVar[Optional["RequestTiming"]] = ContextVar(
+    "current_timing", default=None
+)
+
+
+class RequestTiming:
+    """Накопитель времени запросов к БД и отрисовки шаблонов."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self._template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+def _timed_render(render):
+    """Оборачивает отрисовку шаблона, учитывая только внешний вызов."""
+
+    def wrapper(self, *args, **kwargs):
+        timing = _current_timing.get()
+        if timing is None:
+            return render(self, *args, **kwargs)
+        timing._template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            timing._template_depth -= 1
+            if not timing._template_depth:
+                timing.template_time += time.perf_counter() - started
+
+    wrapper.is_timed = True
+    return wrapper
+
+
+def _install_template_timing() -> None:
+    """
+    Подключает замер отрисовки шаблонов.
+
+    Вызывается при первом замеряемом запросе: пока запросы не
+    замеряются, отрисовка шаблонов не меняется. После подключения
+    незамеряемый запрос платит за это одним чтением `ContextVar`.
+    """
+    if not getattr(Template.render, "is_timed", False):
+        Template.render = _timed_render(Template.render)
+
+
+class ServerTimingMiddleware:
+    """
+    Замеряет время обработки запроса и отдаёт его в заголовке
+    `Server-Timing` и в журнале `core.timing`.
+
+    Замеряется доля запросов, заданная настройкой
+    `SERVER_TIMING_SAMPLE_RATE` (от 0 до 1); по умолчанию замер выключен.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        sample_rate = getattr(settings, "SERVER_TIMING_SAMPLE_RATE", 0.0)
+        if sample_rate <= 0 or random.random() >= sample_rate:
+            return self.get_response(request)
+
+        _install_template_timing()
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timing))
+                response = self.get_response(request)
+        finally:
+            _current_timing.reset(token)
+        total = time.perf_counter() - started
+
+        metrics = {
+            "db": timing.db_time * 1000,
+            "tpl": timing.template_time * 1000,
+            "view": (total - timing.db_time - timing.template_time) * 1000,
+            "total": total * 1000,
+        }
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={metrics["db"]:.1f};desc="{timing.queries} queries"',
+                f'tpl;dur={metrics["tpl"]:.1f};desc="templates"',
+                f'view;dur={metrics["view"]:.1f};desc="python"',
+                f'total;dur={metrics["total"]:.1f}',
+            ]
+        )
+        match = request.resolver_match
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "view": match.view_name if match else None,
+                    "status": response.status_code,
+                    "queries": timing.queries,
+                    **{
+                        f"{name}_ms": round(value, 1)
+                        for name, value in metrics.items()
+                    },
+                },
+                ensure_ascii=False,
+            )
+        )
+        return response
+
+
+class RepeatedQueryError(RuntimeError):
+    """Один и тот же запрос выполнен за запрос слишком много раз."""
+
+
+def query_shape(sql: str) -> str:
+    """Приводит SQL к общему виду: списки `IN (%s, ...)` сворачиваются."""
+    return _IN_LIST_RE.sub("(%s...)", " ".join(sql.split()))
+
+
+class RepeatedQueriesMiddleware:
+    """
+    Ищет N+1 в режиме разработки.
+
+    Считает запросы одинаковой формы за время обработки запроса, пишет
+    повторяющиеся в журнал `core.queries` и завершает запрос ошибкой, если
+    какой-то из них выполнен больше `QUERY_REPEAT_LIMIT` раз. Изменяющие
+    запросы (POST и т. п.) к этому моменту уже записали данные, поэтому
+    превышение для них только пишется в журнал как ошибка. Работает
+    только при `DEBUG = True`.
+    """
+
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        limit = getattr(settings, "QUERY_REPEAT_LIMIT", None)
+        if not settings.DEBUG or limit is None:
+            return self.get_response(request)
+
+        shapes = Counter()
+
+        def count_shape(execute, sql, params, many, context):
+            if not _SAVEPOINT_RE.match(sql):
+                shapes[query_shape(sql)] += 1
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_shape))
+            response = self.get_response(request)
+
+        repeated = [(sql, n) for sql, n in shapes.most_common() if n > 1]
+        for sql, count in repeated:
+            queries_logger.warning(
+                "%s: запрос выполнен %s раз: %s", request.path, count, sql
+            )
+        if repeated and repeated[0][1] > limit:
+            message = (
+                f"{request.path}: запрос выполнен {repeated[0][1]} раз "
+                f"(допустимо {limit}): {repeated[0][0]}"
+            )
+            if request.method not in self.safe_methods:
+                queries_logger.error(message)
+                return response
+            raise RepeatedQueryError(message)
+        return response
+
+
+class ReadReplicaMiddleware:
+    """
+    Направляет чтение страниц из `REPLICA_VIEWS` в реплику.
+
+    После успешного изменяющего запроса (POST и т. п.) пользователь
+    `REPLICA_PIN_SECONDS` секунд читает из основной базы, чтобы видеть
+    свои изменения, даже если реплика отстаёт. Срок хранится в cookie.
+    """
+
+    cookie_name = "db_pin"
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        try:
+            response = self.get_response(request)
+        finally:
+            token = request.__dict__.pop("_read_database_token", None)
+            if token is not None:
+                reset_read_database(token)
+        if request.method not in self.safe_methods and (
+            response.status_code < 400
+        ):
+            window = getattr(settings, "REPLICA_PIN_SECONDS", 0)
+            if window:
+                response.set_cookie(
+                    self.cookie_name,
+                    str(time.time() + window),
+                    max_age=window,
+                    httponly=True,
+                    samesite="Lax",
+                )
+        return response
+
+    def _pinned(self, request: HttpRequest) -> bool:
+        try:
+            return float(request.COOKIES[self.cookie_name]) > time.time()
+        except (KeyError, ValueError):
+            return False
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        replicas = getattr(settings, "DATABASE_REPLICAS", ())
+        if (
+            not replicas
+            or request.method not in self.safe_methods
+            or request.resolver_match.view_name
+            not in getattr(settings, "REPLICA_VIEWS", ())
+            or self._pinned(request)
+        ):
+            return None
+        request._read_database_token = use_read_database(
+            random.choice(replicas)
+        )
+        return None
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 05:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='runtime_ms',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Время выполнения, мс'),
+        ),
+    ]
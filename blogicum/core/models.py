@@ -6,6 +6,10 @@ class PublishedCreatedAtModel(models.Model):
         auto_now_add=True,
         verbose_name="Добавлено",
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Изменено",
+    )
     is_published = models.BooleanField(
         default=True,
         verbose_name="Опубликовано",
@@ -14,3 +18,64 @@ class PublishedCreatedAtModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = "queued", "В очереди"
+        RUNNING = "running", "Выполняется"
+        DONE = "done", "Выполнена"
+        FAILED = "failed", "Ошибка"
+
+    name = models.CharField(max_length=255, verbose_name="Задача")
+    payload = models.JSONField(default=dict, verbose_name="Аргументы")
+    dedupe_key = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        verbose_name="Ключ уникальности",
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        verbose_name="Статус",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name="Попыток"
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3, verbose_name="Максимум попыток"
+    )
+    run_after = models.DateTimeField(verbose_name="Запустить после")
+    locked_by = models.CharField(
+        max_length=64, blank=True, verbose_name="Обработчик"
+    )
+    locked_until = models.DateTimeField(
+        null=True, blank=True, verbose_name="Заблокирована до"
+    )
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Добавлено",
+    )
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Завершена"
+    )
+    runtime_ms = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name="Время выполнения, мс"
+    )
+
+    class Meta:
+        verbose_name = "фоновая задача"
+        verbose_name_plural = "Фоновые задачи"
+        ordering = ("run_after", "id")
+        indexes = (
+            models.Index(
+                fields=("status", "run_after"),
+                name="job_status_run_after_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.name} #{self.pk}"
@@ -0,0 +1,77 @@
+from django.db.migrations.operations import AddIndex, RemoveIndex
+
+
+class AddIndexConcurrently(AddIndex):
+    """
+    Создаёт индекс, не блокируя запись в таблицу.
+
+    На PostgreSQL выполняется `CREATE INDEX CONCURRENTLY`, на остальных
+    СУБД — обычный `AddIndex`. Миграция с этой операцией должна быть
+    объявлена с `atomic = False`.
+    """
+
+    def _concurrently(self, schema_editor) -> bool:
+        return schema_editor.connection.vendor == "postgresql"
+
+    def database_forwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        if not self._concurrently(schema_editor):
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        if not self._concurrently(schema_editor):
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+
+
+class RemoveIndexConcurrently(RemoveIndex):
+    """
+    Удаляет индекс, не блокируя запись в таблицу.
+
+    На PostgreSQL выполняется `DROP INDEX CONCURRENTLY`, на остальных
+    СУБД — обычный `RemoveIndex`. Миграция с этой операцией должна быть
+    объявлена с `atomic = False`.
+    """
+
+    def _concurrently(self, schema_editor) -> bool:
+        return schema_editor.connection.vendor == "postgresql"
+
+    def database_forwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        if not self._concurrently(schema_editor):
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = from_state.models[
+                app_label, self.model_name_lower
+            ].get_index_by_name(self.name)
+            schema_editor.remove_index(model, index, concurrently=True)
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        if not self._concurrently(schema_editor):
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = to_state.models[
+                app_label, self.model_name_lower
+            ].get_index_by_name(self.name)
+            schema_editor.add_index(model, index, concurrently=True)
@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+class PoolTimeout(RuntimeError):
+    """За отведённое время не удалось получить подключение из пула."""
+
+
+class ConnectionPool:
+    """
+    Пул подключений к БД внутри процесса.
+
+    Подключение, прожившее дольше `max_lifetime` секунд, закрывается при
+    возврате или выдаче и заменяется новым. Перед выдачей простаивавшего
+    подключения выполняется проверка `check`; не прошедшее её подключение
+    отбрасывается. При возврате выполняется `reset` (например, откат
+    незавершённой транзакции).
+
+    :param connect: Функция, открывающая новое подключение.
+    :param max_size: Наибольшее число подключений, выданных и простаивающих.
+    :param max_lifetime: Наибольший срок жизни подключения, в секундах.
+    :param timeout: Сколько ждать свободного подключения, в секундах.
+    :param check: Проверка подключения перед выдачей; должна бросить
+        исключение, если подключение неработоспособно.
+    :param check_idle: Проверять подключения, простаивавшие дольше этого
+        числа секунд; 0 — проверять всегда.
+    :param reset: Приведение подключения в исходное состояние при возврате.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        max_size: int = 10,
+        max_lifetime: float = 30 * 60,
+        timeout: float = 30,
+        check: Optional[Callable[[Any], None]] = None,
+        check_idle: float = 0,
+        reset: Optional[Callable[[Any], None]] = None,
+    ):
+        self.connect = connect
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.check = check
+        self.check_idle = check_idle
+        self.reset = reset
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._created: Dict[int, float] = {}
+        self._condition = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        """Число открытых подключений, выданных и простаивающих."""
+        return len(self._created)
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def _expired(self, connection) -> bool:
+        created = self._created.get(id(connection), 0)
+        return time.monotonic() - created >= self.max_lifetime
+
+    def _discard(self, connection) -> None:
+        self._created.pop(id(connection), None)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _healthy(self, connection, idle_since: float) -> bool:
+        if self._expired(connection):
+            return False
+        if self.check is None:
+            return True
+        if time.monotonic() - idle_since < self.check_idle:
+            return True
+        try:
+            self.check(connection)
+        except Exception:
+            return False
+        return True
+
+    def getconn(self):
+        """Выдаёт подключение: простаивающее, новое или дождавшись возврата."""
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            while True:
+                while self._idle:
+                    connection, idle_since = self._idle.pop()
+                    if self._healthy(connection, idle_since):
+                        return connection
+                    self._discard(connection)
+                if self.size < self.max_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    raise PoolTimeout(
+                        f"Нет свободных подключений за {self.timeout} с "
+                        f"(размер пула {self.max_size})."
+                    )
+            # Место занимается до подключения, чтобы не превысить max_size.
+            placeholder = object()
+            self._created[id(placeholder)] = time.monotonic()
+        try:
+            connection = self.connect()
+        except Exception:
+            with self._condition:
+                self._created.pop(id(placeholder), None)
+                self._condition.notify()
+            raise
+        with self._condition:
+            del self._created[id(placeholder)]
+            self._created[id(connection)] = time.monotonic()
+        return connection
+
+    def putconn(self, connection, discard: bool = False) -> None:
+        """
+        Возвращает подключение в пул.
+
+        :param discard: Закрыть подключение, а не вернуть его в пул.
+        """
+        with self._condition:
+            if id(connection) not in self._created:
+                connection.close()
+                return
+            if not discard and not self._expired(connection):
+                try:
+                    if self.reset is not None:
+                        self.reset(connection)
+                except Exception:
+                    discard = True
+            else:
+                discard = True
+            if discard:
+                self._discard(connection)
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def closeall(self) -> None:
+        """Закрывает простаивающие подключения."""
+        with self._condition:
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+            self._condition.notify_all()
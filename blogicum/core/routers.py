@@ -0,0 +1,55 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_read_database: ContextVar[Optional[str]] = ContextVar(
+    "read_database", default=None
+)
+
+
+def use_read_database(alias: Optional[str]):
+    """
+    Направляет чтение в текущем контексте в базу `alias`.
+
+    :return: Токен для `reset_read_database`.
+    """
+    return _read_database.set(alias)
+
+
+def reset_read_database(token) -> None:
+    _read_database.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Маршрутизатор для реплик из настройки `DATABASE_REPLICAS`.
+
+    Чтение уходит в реплику, только если её выбрал
+    `core.middleware.ReadReplicaMiddleware` для текущего запроса; иначе,
+    как и вся запись, — в основную базу. Схема у всех баз одинаковая.
+    """
+
+    def _replicas(self):
+        return set(getattr(settings, "DATABASE_REPLICAS", ()))
+
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        # Без явного ответа Django записал бы объект в базу, из которой
+        # он был прочитан, то есть в реплику.
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db in self._replicas():
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *self._replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
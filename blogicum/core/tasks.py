@@ -0,0 +1,326 @@
+import hashlib
+import json
+import logging
+import time
+import traceback
+import uuid
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Union
+
+from django.db.models import Case, Count, F, Min, Q, Sum, When
+from django.utils import timezone
+
+from core.models import Job
+
+logger = logging.getLogger("core.tasks")
+
+VISIBILITY_TIMEOUT = 60 * 5
+RETRY_BACKOFF = 30
+JOB_RETENTION = 60 * 60 * 24 * 7
+PURGE_INTERVAL = 60 * 60
+
+_registry: Dict[str, "Task"] = {}
+
+
+class Task:
+    """Зарегистрированная фоновая задача."""
+
+    def __init__(
+        self,
+        func: Callable,
+        name: str,
+        max_attempts: int,
+        every: Optional[int] = None,
+    ):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.every = every
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, delay: int = 0, **payload) -> Optional[Job]:
+        return enqueue(self.name, delay=delay, **payload)
+
+
+def task(
+    name: Optional[str] = None,
+    max_attempts: int = 3,
+    every: Optional[int] = None,
+):
+    """
+    Регистрирует функцию как фоновую задачу.
+
+    Аргументы задачи передаются только именованными и должны сериализоваться
+    в JSON.
+
+    :param every: Период в секундах для периодической задачи без
+        аргументов. Первый запуск ставит `schedule_periodic_tasks()`,
+        следующий ставится после завершения предыдущего.
+    """
+
+    def decorator(func: Callable) -> Task:
+        registered = Task(
+            func,
+            name or f"{func.__module__}.{func.__name__}",
+            max_attempts,
+            every,
+        )
+        _registry[registered.name] = registered
+        return registered
+
+    return decorator
+
+
+def enqueue(
+    name: Union[str, Task], delay: int = 0, **payload
+) -> Optional[Job]:
+    """
+    Ставит задачу в очередь.
+
+    Если такая же задача с теми же аргументами ещё ждёт выполнения,
+    новая не создаётся.
+
+    :param name: Задача или её имя.
+    :param delay: Задержка запуска в секундах.
+    :return: Созданная задача или None, если она уже в очереди.
+    """
+    registered = _registry[getattr(name, "name", name)]
+    dedupe_key = hashlib.sha256(
+        json.dumps([registered.name, payload], sort_keys=True).encode()
+    ).hexdigest()
+    if Job.objects.filter(
+        dedupe_key=dedupe_key, status=Job.Status.QUEUED
+    ).exists():
+        return None
+    return Job.objects.create(
+        name=registered.name,
+        payload=payload,
+        dedupe_key=dedupe_key,
+        max_attempts=registered.max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def schedule_periodic_tasks() -> int:
+    """
+    Ставит в очередь периодические задачи, которых там ещё нет.
+
+    :return: Количество поставленных задач.
+    """
+    return sum(
+        enqueue(registered) is not None
+        for registered in _registry.values()
+        if registered.every
+    )
+
+
+def _reschedule(name: str) -> None:
+    registered = _registry.get(name)
+    if registered is not None and registered.every:
+        enqueue(registered, delay=registered.every)
+
+
+def _fail_expired(now) -> None:
+    """
+    Завершает ошибкой задачи, чей обработчик не отчитался о последней
+    попытке, и ставит следующий запуск периодических из них.
+    """
+    expired = Job.objects.filter(
+        status=Job.Status.RUNNING,
+        locked_until__lt=now,
+        attempts__gte=F("max_attempts"),
+    )
+    for pk, name in expired.values_list("pk", "name"):
+        # Условный UPDATE: задачу завершает один обработчик, и только он
+        # ставит её следующий запуск.
+        failed = expired.filter(pk=pk).update(
+            status=Job.Status.FAILED,
+            finished_at=now,
+            locked_until=None,
+            last_error="Превышено время выполнения.",
+        )
+        if failed:
+            logger.warning(
+                "Задача %s #%s не отчиталась о последней попытке.", name, pk
+            )
+            _reschedule(name)
+
+
+def _claimable(now) -> Q:
+    return Q(status=Job.Status.QUEUED, run_after__lte=now) | Q(
+        status=Job.Status.RUNNING,
+        locked_until__lt=now,
+        attempts__lt=F("max_attempts"),
+    )
+
+
+def claim_jobs(
+    limit: int, visibility_timeout: int = VISIBILITY_TIMEOUT
+) -> List[Job]:
+    """
+    Захватывает до `limit` готовых к запуску задач.
+
+    Захват — условный UPDATE по одной строке, поэтому несколько
+    обработчиков не получат одну задачу. Задача, обработчик которой не
+    отчитался за `visibility_timeout` секунд, снова становится доступной.
+    """
+    now = timezone.now()
+    _fail_expired(now)
+
+    token = uuid.uuid4().hex
+    claimed = []
+    candidates = Job.objects.filter(_claimable(now)).values_list(
+        "pk", flat=True
+    )[: limit * 2]
+    for pk in candidates:
+        if len(claimed) >= limit:
+            break
+        updated = Job.objects.filter(_claimable(now), pk=pk).update(
+            status=Job.Status.RUNNING,
+            locked_by=token,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+            attempts=F("attempts") + 1,
+        )
+        if updated:
+            claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed, locked_by=token))
+
+
+def execute_job(job_id: int, token: str) -> str:
+    """
+    Выполняет захваченную задачу и записывает результат.
+
+    Результат сохраняется, только если задача всё ещё принадлежит этому
+    обработчику (не истёк таймаут видимости).
+
+    :return: Итоговый статус задачи.
+    """
+    job = Job.objects.get(pk=job_id)
+    owned = Job.objects.filter(pk=job_id, locked_by=token)
+    started = time.monotonic()
+    try:
+        _registry[job.name](**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            status = Job.Status.QUEUED
+            owned.update(
+                status=status,
+                run_after=now
+                + timedelta(seconds=RETRY_BACKOFF * 2 ** (job.attempts - 1)),
+                locked_by="",
+                locked_until=None,
+                last_error=error,
+            )
+        else:
+            status = Job.Status.FAILED
+            owned.update(
+                status=status,
+                finished_at=now,
+                locked_until=None,
+                last_error=error,
+            )
+            _reschedule(job.name)
+        logger.warning(
+            "Задача %s завершилась с ошибкой (попытка %s из %s).",
+            job,
+            job.attempts,
+            job.max_attempts,
+            exc_info=True,
+        )
+        return status
+
+    runtime_ms = int((time.monotonic() - started) * 1000)
+    owned.update(
+        status=Job.Status.DONE,
+        finished_at=timezone.now(),
+        locked_until=None,
+        runtime_ms=runtime_ms,
+    )
+    _reschedule(job.name)
+    logger.info("Задача %s выполнена за %s мс.", job, runtime_ms)
+    return Job.Status.DONE
+
+
+def run_pending_jobs(limit: int = 100) -> int:
+    """
+    Выполняет готовые задачи в текущем процессе.
+
+    :return: Количество обработанных задач.
+    """
+    processed = 0
+    while processed < limit:
+        jobs = claim_jobs(min(10, limit - processed))
+        if not jobs:
+            break
+        for job in jobs:
+            execute_job(job.pk, job.locked_by)
+        processed += len(jobs)
+    return processed
+
+
+def task_metrics() -> dict:
+    """
+    Возвращает состояние очереди и счётчики выполнения по задачам.
+
+    Счётчики считаются по таблице задач, поэтому учитывают все процессы и
+    обработчики, но только задачи, которые ещё не удалил
+    `purge_finished_jobs` (выполненные за последние `JOB_RETENTION`
+    секунд).
+    """
+    queue = Job.objects.order_by().values("status").annotate(
+        total=Count("id"), oldest=Min("run_after")
+    )
+    rows = (
+        Job.objects.order_by()
+        .values("name")
+        .annotate(
+            succeeded=Count("id", filter=Q(status=Job.Status.DONE)),
+            failed=Count("id", filter=Q(status=Job.Status.FAILED)),
+            # Задача в очереди с попытками ждёт повтора; у остальных
+            # повторами были все попытки, кроме первой.
+            retried=Sum(
+                Case(
+                    When(status=Job.Status.QUEUED, then=F("attempts")),
+                    default=F("attempts") - 1,
+                ),
+                filter=Q(attempts__gt=0),
+            ),
+            runtime_ms=Sum("runtime_ms"),
+        )
+    )
+    counters = {
+        name: dict.fromkeys(
+            ("succeeded", "retried", "failed", "runtime_ms"), 0
+        )
+        for name in _registry
+    }
+    for row in rows:
+        name = row.pop("name")
+        counters[name] = {event: value or 0 for event, value in row.items()}
+    return {
+        "queue": {
+            row["status"]: {"total": row["total"], "oldest": row["oldest"]}
+            for row in queue
+        },
+        "tasks": counters,
+    }
+
+
+@task(name="core.purge_finished_jobs", every=PURGE_INTERVAL)
+def purge_finished_jobs(retention: int = JOB_RETENTION) -> int:
+    """
+    Удаляет выполненные задачи старше `retention` секунд.
+
+    Задачи с ошибкой остаются для разбора.
+
+    :return: Количество удалённых задач.
+    """
+    deleted, _ = Job.objects.filter(
+        status=Job.Status.DONE,
+        finished_at__lt=timezone.now() - timedelta(seconds=retention),
+    ).delete()
+    return deleted
@@ -0,0 +1,100 @@
+"""
+`date_hierarchy` админки без `SELECT DISTINCT` по усечённым датам.
+
+Стандартный тег на каждом уровне перебирает все строки выборки, чтобы
+найти годы, месяцы или дни с записями. Здесь уровень строится из
+диапазона `MIN`/`MAX` по полю, который берётся из индекса; в списке могут
+оказаться годы, месяцы или дни без записей.
+"""
+from datetime import date, datetime, timedelta
+from typing import List
+
+from django import template
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+from django.db.models import Max, Min, QuerySet
+from django.utils import timezone
+
+register = template.Library()
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.date()
+    return value
+
+
+def _truncate(value: date, kind: str) -> date:
+    if kind == "year":
+        return value.replace(month=1, day=1)
+    if kind == "month":
+        return value.replace(day=1)
+    return value
+
+
+def _next(value: date, kind: str) -> date:
+    if kind == "year":
+        return value.replace(year=value.year + 1)
+    if kind == "month":
+        if value.month == 12:
+            return value.replace(year=value.year + 1, month=1)
+        return value.replace(month=value.month + 1)
+    return value + timedelta(days=1)
+
+
+class RangeDates:
+    """Выборка, у которой `dates()` и `datetimes()` строятся по диапазону."""
+
+    def __init__(self, queryset: QuerySet):
+        self.queryset = queryset
+        self._aggregates = {}
+
+    def aggregate(self, **kwargs):
+        # Тег сам запрашивает MIN/MAX для выбора уровня: не повторяем.
+        key = repr(sorted(kwargs.items()))
+        if key not in self._aggregates:
+            self._aggregates[key] = self.queryset.aggregate(**kwargs)
+        return self._aggregates[key]
+
+    def dates(self, field_name: str, kind: str, **kwargs) -> List[date]:
+        bounds = self.aggregate(first=Min(field_name), last=Max(field_name))
+        if bounds["first"] is None:
+            return []
+        first, last = (
+            _as_date(bounds["first"]),
+            _as_date(bounds["last"]),
+        )
+        current, last = _truncate(first, kind), _truncate(last, kind)
+        values = []
+        while current <= last:
+            values.append(current)
+            current = _next(current, kind)
+        return values
+
+    datetimes = dates
+
+
+class _RangeChangeList:
+    def __init__(self, cl):
+        self._cl = cl
+        self.queryset = RangeDates(cl.queryset)
+
+    def __getattr__(self, name):
+        return getattr(self._cl, name)
+
+
+def range_date_hierarchy(cl):
+    return date_hierarchy(_RangeChangeList(cl))
+
+
+@register.tag(name="range_date_hierarchy")
+def range_date_hierarchy_tag(parser, token):
+    return InclusionAdminNode(
+        parser,
+        token,
+        func=range_date_hierarchy,
+        template_name="date_hierarchy.html",
+        takes_context=False,
+    )
@@ -41,6 +41,36 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True, scope="session")
+def cache_location(tmp_path_factory):
+    """Файловый кеш тестов лежит во временном каталоге, а не в проекте."""
+    from django.conf import settings
+
+    caches = {"default": {**settings.CACHES["default"]}}
+    if caches["default"]["BACKEND"].endswith("FileBasedCache"):
+        caches["default"]["LOCATION"] = str(tmp_path_factory.mktemp("cache"))
+    with override_settings(CACHES=caches):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_view_buffer():
+    """Просмотры теста не переживают его и не пишутся в базу при выходе."""
+    from blog import views_counter
+
+    views_counter._spilled_at = time.monotonic()
+    yield
+    views_counter._buffer.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -92,6 +122,8 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.queries",
+    "fixtures.databases",
     "adapters.comment",
 ]
 
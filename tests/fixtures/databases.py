@@ -0,0 +1,118 @@
+"""
+Тестовые базы данных.
+
+Запуск тестов на PostgreSQL: `pytest --postgres`. Фикстура поднимает
+временный кластер из двоичных файлов PostgreSQL (каталог `PG_BIN` или
+`pg_ctl` из PATH) и переключает на него базу `default`. Без `--postgres`
+тесты идут на SQLite из настроек.
+
+Кроме того, объявляется отдельная база `replica` с той же схемой, но
+своими данными: тесты маршрутизации запрашивают её через
+`django_db(databases=...)`.
+"""
+import os
+import shutil
+import socket
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+POSTGRES_TEST_DATABASE = {
+    "ENGINE": "core.backends.postgresql",
+    "NAME": "blogicum",
+    "USER": "postgres",
+    "PASSWORD": "",
+    "HOST": "127.0.0.1",
+    "OPTIONS": {"pool": {"max_size": 4, "timeout": 10}},
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--postgres",
+        action="store_true",
+        help="Запустить тесты на временном кластере PostgreSQL.",
+    )
+
+
+def _postgres_bin() -> Optional[Path]:
+    if os.environ.get("PG_BIN"):
+        return Path(os.environ["PG_BIN"])
+    pg_ctl = shutil.which("pg_ctl")
+    return Path(pg_ctl).parent if pg_ctl else None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def postgres_server(tmp_path_factory):
+    bin_dir = _postgres_bin()
+    if bin_dir is None:
+        pytest.skip("Не найдены двоичные файлы PostgreSQL (задайте PG_BIN).")
+    data_dir = tmp_path_factory.mktemp("postgres")
+    port = _free_port()
+    subprocess.run(
+        [
+            bin_dir / "initdb",
+            "-D", data_dir,
+            "-U", "postgres",
+            "--auth=trust",
+            "--encoding=UTF8",
+            "--no-sync",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    options = (
+        f"-F -p {port} -k {data_dir} -c listen_addresses=127.0.0.1"
+    )
+    subprocess.run(
+        [
+            bin_dir / "pg_ctl",
+            "-D", data_dir,
+            "-l", data_dir / "server.log",
+            "-o", options,
+            "-w", "start",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    yield {"PORT": str(port)}
+    subprocess.run(
+        [bin_dir / "pg_ctl", "-D", data_dir, "-m", "fast", "-w", "stop"],
+        capture_output=True,
+    )
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(
+        request, django_db_modify_db_settings_parallel_suffix
+):
+    from django.db import connections
+
+    if request.config.getoption("--postgres"):
+        server = request.getfixturevalue("postgres_server")
+        connections["default"].close()
+        connections.settings["default"].update(
+            POSTGRES_TEST_DATABASE, CONN_MAX_AGE=0, **server
+        )
+        del connections["default"]
+    if "replica" not in connections.settings:
+        connections.settings["replica"] = {
+            key: value
+            for key, value in connections.settings["default"].items()
+            if key != "TEST"
+        }
+        connections.ensure_defaults("replica")
+        connections.prepare_test_settings("replica")
+        if connections["replica"].vendor != "sqlite":
+            # SQLite и так создаёт для каждого псевдонима свою базу в памяти.
+            connections.settings["replica"]["TEST"]["NAME"] = (
+                f"test_{connections.settings['replica']['NAME']}_replica"
+            )
@@ -0,0 +1,32 @@
+from typing import Callable
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+def assert_query_budget(client: Client, url: str, budget: int) -> None:
+    """
+    Проверяет, что страница по адресу `url` выполняет ровно `budget`
+    запросов к базе данных.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    executed = len(context.captured_queries)
+    queries = "\n".join(
+        f"{n}. {query['sql']}"
+        for n, query in enumerate(context.captured_queries, start=1)
+    )
+    assert executed == budget, (
+        f"Страница `{url}` выполняет {executed} запросов к БД вместо"
+        f" {budget}:\n{queries}"
+    )
+
+
+@pytest.fixture
+def query_budget() -> Callable[[Client, str, int], None]:
+    return assert_query_budget
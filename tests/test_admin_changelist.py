@@ -0,0 +1,63 @@
+from datetime import date
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from core.templatetags.admin_dates import RangeDates
+
+
+@pytest.mark.django_db
+def test_range_dates_cover_min_max(mixer, user, published_category):
+    for pub_date in (
+        timezone.datetime(2025, 11, 20, 12, tzinfo=timezone.utc),
+        timezone.datetime(2026, 2, 3, 12, tzinfo=timezone.utc),
+    ):
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            pub_date=pub_date,
+        )
+    queryset = RangeDates(Post.objects.all())
+    assert queryset.dates("pub_date", "year") == [
+        date(2025, 1, 1), date(2026, 1, 1)
+    ], "Убедитесь, что годы иерархии дат берутся из диапазона MIN/MAX."
+    assert queryset.datetimes("pub_date", "month") == [
+        date(2025, 11, 1),
+        date(2025, 12, 1),
+        date(2026, 1, 1),
+        date(2026, 2, 1),
+    ], (
+        "Убедитесь, что месяцы иерархии дат идут подряд от первого до"
+        " последнего, в том числе месяцы без публикаций."
+    )
+    assert RangeDates(Post.objects.none()).dates("pub_date", "day") == [], (
+        "Убедитесь, что у пустой выборки нет дат."
+    )
+
+
+@pytest.mark.django_db
+def test_post_changelist_filters(
+        admin_client, many_posts_with_published_locations, another_category
+):
+    posts = many_posts_with_published_locations
+    posts[0].category = another_category
+    posts[0].save()
+    response = admin_client.get(
+        "/admin/blog/post/", {"category": another_category.pk}
+    )
+    assert response.status_code == 200
+    shown = list(response.context["cl"].result_list)
+    assert shown == [posts[0]], (
+        "Убедитесь, что фильтр по категории в списке публикаций оставляет"
+        " только публикации выбранной категории."
+    )
+    response = admin_client.get(
+        "/admin/blog/post/",
+        {"pub_date__year": posts[0].pub_date.year},
+    )
+    assert response.status_code == 200, (
+        "Убедитесь, что список публикаций открывается с выбранным годом"
+        " в иерархии дат."
+    )
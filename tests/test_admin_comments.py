@@ -0,0 +1,124 @@
+import pytest
+from django.contrib.admin import site
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from blog.admin import CommentInline
+from blog.constants import COMMENT_INLINE_LIMIT
+from blog.models import Comment, Post
+
+
+@pytest.fixture
+def commented_post(mixer, post_with_published_location):
+    mixer.cycle(COMMENT_INLINE_LIMIT + 5).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    post_with_published_location.refresh_from_db()
+    return post_with_published_location
+
+
+def _inline_formset(response):
+    return response.context["inline_admin_formsets"][0].formset
+
+
+@pytest.mark.django_db
+def test_comment_inline_is_paginated(admin_client, commented_post):
+    url = f"/admin/blog/post/{commented_post.pk}/change/"
+    newest_first = list(
+        commented_post.comments.order_by("-created_at", "-pk")
+    )
+    first = _inline_formset(admin_client.get(url))
+    second = _inline_formset(admin_client.get(url + first.next_url))
+    for formset, expected in (
+        (first, newest_first[:COMMENT_INLINE_LIMIT]),
+        (second, newest_first[COMMENT_INLINE_LIMIT:]),
+    ):
+        shown = [form.instance for form in formset.initial_forms]
+        assert len(shown) == len(expected), (
+            "Убедитесь, что на странице публикации в админке выводится не"
+            f" больше {COMMENT_INLINE_LIMIT} форм комментариев."
+        )
+        assert shown == expected, (
+            "Убедитесь, что комментарии в админке идут страницами, новые"
+            " первыми."
+        )
+    assert second.next_url is None
+    back = _inline_formset(admin_client.get(url + second.previous_url))
+    assert len(back.initial_forms) == COMMENT_INLINE_LIMIT
+
+    response = admin_client.get(url, {"comments_cursor": "x"})
+    assert response.status_code == 200, (
+        "Убедитесь, что неверный курсор комментариев не ломает страницу"
+        " публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_inline_post_keeps_page(
+        admin_client, admin_user, mixer, commented_post
+):
+    url = f"/admin/blog/post/{commented_post.pk}/change/"
+    response = admin_client.get(url)
+    formset = _inline_formset(response)
+    shown = [form.instance for form in formset.initial_forms]
+    assert (
+        f'name="comments_anchor" value="{formset.anchor}"'
+        in response.content.decode()
+    ), "Убедитесь, что граница страницы комментариев передаётся в форме."
+    # Комментарий, добавленный между открытием и отправкой формы.
+    mixer.blend("blog.Comment", post=commented_post)
+
+    data = {
+        formset.add_prefix(name): value
+        for name, value in formset.management_form.initial.items()
+    }
+    for form in formset.initial_forms:
+        for name in form.fields:
+            value = form[name].value()
+            if value is not None:
+                data[form.add_prefix(name)] = value
+    data["comments_anchor"] = formset.anchor
+    request = RequestFactory().post(url, data)
+    request.user = admin_user
+    inline = CommentInline(Post, site)
+    submitted = inline.get_formset(request, commented_post)(
+        data, instance=commented_post, prefix=formset.prefix
+    )
+    assert submitted.is_valid(), (
+        "Убедитесь, что формы комментариев отправляются для той же"
+        f" страницы, что была открыта: {submitted.errors}"
+    )
+    assert [form.instance for form in submitted.initial_forms] == shown
+
+
+@pytest.mark.django_db
+def test_delete_comments_action(
+        admin_client, commented_post, mixer, post_of_another_author
+):
+    other = mixer.blend("blog.Comment", post=post_of_another_author)
+    selected = list(commented_post.comments.values_list("pk", flat=True)[:3])
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.post(
+            "/admin/blog/comment/",
+            {
+                "action": "delete_selected_comments",
+                "_selected_action": selected,
+            },
+        )
+    assert response.status_code == 302
+    deletes = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith('DELETE FROM "blog_comment"')
+    ]
+    assert len(deletes) == 1, (
+        "Убедитесь, что выбранные комментарии удаляются одним запросом."
+    )
+    assert not Comment.objects.filter(pk__in=selected).exists()
+    assert Comment.objects.filter(pk=other.pk).exists()
+    remaining = commented_post.comments.count()
+    assert Post.objects.get(pk=commented_post.pk).comment_count == remaining, (
+        "Убедитесь, что после удаления комментариев из админки счётчик"
+        " комментариев публикации верный."
+    )
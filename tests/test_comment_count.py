@@ -0,0 +1,72 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_writes(
+        mixer, user_client, post_with_published_location, another_user
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Первый"})
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при добавлении комментария увеличивается"
+        " `Post.comment_count`."
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(
+        f"/posts/{post.id}/delete_comment/{comment.id}/"
+    )
+    another_user.delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что при удалении комментария, в том числе каскадном,"
+        " уменьшается `Post.comment_count`."
+    )
+
+
+@pytest.mark.django_db
+def test_post_delete_skips_comment_receivers(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    with CaptureQueriesContext(connection) as context:
+        user_client.post(f"/posts/{post.id}/delete/")
+    assert not Post.objects.filter(pk=post.pk).exists()
+    updates = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert not updates, (
+        "Убедитесь, что при удалении публикации её комментарии не"
+        f" обновляют счётчик удаляемой публикации:\n{updates}"
+    )
+    comment = mixer.blend("blog.Comment")
+    comment.delete()
+    comment.post.refresh_from_db()
+    assert comment.post.comment_count == 0, (
+        "Убедитесь, что после удаления публикации удаление комментариев"
+        " других публикаций по-прежнему обновляет их счётчики."
+    )
+
+
+@pytest.mark.django_db
+def test_rebuild_comment_counts(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Post.objects.update(comment_count=0)
+
+    call_command("rebuild_comment_counts", stdout=StringIO())
+
+    post.refresh_from_db()
+    assert post.comment_count == 3
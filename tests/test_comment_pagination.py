@@ -0,0 +1,74 @@
+import pytest
+
+from blog.constants import COMMENTS_LIMIT
+from blog.models import Comment
+
+
+@pytest.fixture
+def many_comments(user, post_with_published_location):
+    return Comment.objects.bulk_create(
+        Comment(
+            post=post_with_published_location,
+            author=user,
+            text=f"Комментарий {i}",
+        )
+        for i in range(COMMENTS_LIMIT + 5)
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_shows_first_comments_page(
+        client, post_with_published_location, many_comments
+):
+    response = client.get(f"/posts/{post_with_published_location.id}/")
+    page = response.context["comments"]
+    assert [comment.text for comment in page] == [
+        comment.text for comment in many_comments[:COMMENTS_LIMIT]
+    ], (
+        "Убедитесь, что на странице публикации выводятся только первые "
+        "`COMMENTS_LIMIT` комментариев, от старых к новым."
+    )
+    assert page.has_next()
+    assert "Показать ещё" in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_post_comments_fragment(
+        client, post_with_published_location, many_comments
+):
+    post_id = post_with_published_location.id
+    first_page = client.get(f"/posts/{post_id}/").context["comments"]
+    response = client.get(
+        f"/posts/{post_id}/comments/",
+        {"cursor": first_page.next_cursor},
+    )
+    assert response.status_code == 200
+    page = response.context["comments"]
+    assert [comment.text for comment in page] == [
+        comment.text for comment in many_comments[COMMENTS_LIMIT:]
+    ], (
+        "Убедитесь, что фрагмент `/posts/<post_id>/comments/` отдаёт "
+        "следующую страницу комментариев по курсору."
+    )
+    assert not page.has_next()
+    content = response.content.decode("utf-8")
+    assert "<html" not in content, (
+        "Убедитесь, что фрагмент комментариев не наследует базовый шаблон."
+    )
+
+
+@pytest.mark.django_db
+def test_post_comments_fragment_hidden_post(
+        client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=False,
+    )
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404, (
+        "Убедитесь, что комментарии снятой с публикации записи недоступны "
+        "другим пользователям."
+    )
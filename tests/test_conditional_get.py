@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_post_detail_not_modified(
+        user_client, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    another_user_client.get(url)
+    response = another_user_client.get(url)
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified"
+    ), "Убедитесь, что страница публикации отдаёт ETag и Last-Modified."
+
+    cached = another_user_client.get(
+        url, HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Новый"})
+    changed = another_user_client.get(
+        url, HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert changed.status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый комментарий меняет ETag страницы публикации."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("client_name", ["user_client", "unlogged_client"])
+def test_feed_not_modified(request, client_name, post_with_published_location):
+    client = request.getfixturevalue(client_name)
+    post = post_with_published_location
+    for url in (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ):
+        etag = client.get(url)["ETag"]
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что лента `{url}` отвечает 304 на If-None-Match."
+        )
+
+    post.title = "Изменённый заголовок"
+    post.save()
+    assert client.get("/", HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTPStatus.OK
+    )
+
+
+@pytest.mark.django_db
+def test_feed_validator_without_queries(
+        user_client, user, post_with_published_location
+):
+    etag = user_client.get("/")["ETag"]
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    post_queries = [
+        query["sql"]
+        for query in context.captured_queries
+        if '"blog_post"' in query["sql"]
+    ]
+    assert not post_queries, (
+        "Убедитесь, что валидатор ленты не обращается к таблице публикаций:"
+        f"\n{post_queries}"
+    )
+
+    user.username = "renamed"
+    user.save()
+    assert user_client.get("/", HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTPStatus.OK
+    ), "Убедитесь, что смена имени автора меняет ETag ленты."
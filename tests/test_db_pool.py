@@ -0,0 +1,67 @@
+import sqlite3
+import threading
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from core.pool import ConnectionPool, PoolTimeout
+
+
+def _check(db):
+    db.execute("SELECT 1")
+
+
+def test_pool_reuses_connections():
+    pool = ConnectionPool(lambda: sqlite3.connect(":memory:"), max_size=2)
+    first = pool.getconn()
+    pool.putconn(first)
+    assert pool.getconn() is first, (
+        "Убедитесь, что возвращённое в пул подключение выдаётся повторно."
+    )
+    assert pool.size == 1
+
+
+def test_pool_discards_broken_and_expired_connections():
+    pool = ConnectionPool(
+        lambda: sqlite3.connect(":memory:"), max_size=2, check=_check
+    )
+    broken = pool.getconn()
+    pool.putconn(broken)
+    broken.close()
+    fresh = pool.getconn()
+    assert fresh is not broken, (
+        "Убедитесь, что подключение, не прошедшее проверку, не выдаётся."
+    )
+    pool.max_lifetime = 0
+    pool.putconn(fresh)
+    assert pool.size == 0 and pool.idle == 0, (
+        "Убедитесь, что подключение старше `max_lifetime` закрывается."
+    )
+
+
+def test_pool_waits_for_returned_connection():
+    pool = ConnectionPool(
+        lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        max_size=1,
+        timeout=0.05,
+    )
+    held = pool.getconn()
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+
+    pool.timeout = 5
+    threading.Timer(0.05, pool.putconn, args=(held,)).start()
+    assert pool.getconn() is held, (
+        "Убедитесь, что при заполненном пуле ожидается возврат подключения."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_feed_indexes_are_partial():
+    sql = call_command("sqlmigrate", "blog", "0008")
+    assert sql.count('WHERE "is_published"') == 2, (
+        "Убедитесь, что индексы лент по опубликованным записям частичные."
+    )
+    if connection.vendor == "postgresql":
+        assert "CONCURRENTLY" in sql
@@ -0,0 +1,47 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_anonymous_feed_is_cached(
+        unlogged_client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    feeds = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in feeds:
+        unlogged_client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = unlogged_client.get(url)
+        assert response.status_code == 200
+        assert not [
+            query for query in context.captured_queries
+            if "blog_post" in query["sql"]
+        ], f"Убедитесь, что страница `{url}` кешируется для анонимов."
+
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Новый"})
+    for url in feeds:
+        content = unlogged_client.get(url).content.decode()
+        assert "Комментарии (1)" in content, (
+            f"Убедитесь, что новый комментарий сбрасывает кеш ленты `{url}`."
+        )
+
+
+@pytest.mark.django_db
+def test_comment_keeps_unrelated_feeds(
+        mixer, unlogged_client, post_with_published_location,
+        post_of_another_author
+):
+    url = f"/profile/{post_of_another_author.author.username}/"
+    unlogged_client.get(url)
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    with CaptureQueriesContext(connection) as context:
+        unlogged_client.get(url)
+    assert not [
+        query for query in context.captured_queries
+        if "blog_post" in query["sql"]
+    ], "Комментарий не должен сбрасывать ленты без этой публикации."
@@ -0,0 +1,139 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.cache import INDEX_FEED, category_feed
+from blog.counts import _keys
+from blog.publication import (
+    PUBLICATION_STATE_KEY,
+    refresh_publication_schedule,
+)
+from blog.selectors import get_post_queryset
+
+# Любой агрегат COUNT по таблице публикаций: `COUNT(*)` пагинатора,
+# `COUNT("blog_post"."id")` в агрегатах и аннотациях.
+COUNT_RE = re.compile(r'\bCOUNT\s*\(.*\bFROM\s+"blog_post"', re.S | re.I)
+
+
+def _cached_count(feed):
+    from django.core.cache import cache
+
+    return cache.get(_keys(feed)[0])
+
+
+def _make_post(mixer, user, category, **kwargs):
+    params = dict(
+        author=user,
+        category=category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    params.update(kwargs)
+    return mixer.blend("blog.Post", **params)
+
+
+@pytest.mark.django_db
+def test_feed_count_is_cached(
+        user_client, many_posts_with_published_locations
+):
+    def count_queries():
+        with CaptureQueriesContext(connection) as context:
+            user_client.get("/")
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if COUNT_RE.search(query["sql"])
+        ]
+
+    assert count_queries(), "Первый запрос ленты должен посчитать записи."
+    assert not count_queries(), (
+        "Убедитесь, что количество записей ленты берётся из кеша и "
+        "подсчёт публикаций не выполняется на каждый запрос."
+    )
+    assert _cached_count(INDEX_FEED) == len(
+        many_posts_with_published_locations
+    )
+
+
+@pytest.mark.django_db
+def test_feed_count_follows_publication(
+        mixer, user, user_client, published_category
+):
+    feed = category_feed(published_category.slug)
+    post = _make_post(mixer, user, published_category)
+    user_client.get("/")
+    user_client.get(f"/category/{published_category.slug}/")
+    assert _cached_count(INDEX_FEED) == 1 and _cached_count(feed) == 1
+
+    _make_post(mixer, user, published_category)
+    assert _cached_count(INDEX_FEED) == 2 and _cached_count(feed) == 2, (
+        "Убедитесь, что новая публикация увеличивает счётчики её лент."
+    )
+
+    post.is_published = False
+    post.save()
+    assert _cached_count(INDEX_FEED) == 1 and _cached_count(feed) == 1, (
+        "Убедитесь, что снятая с публикации запись уменьшает счётчики."
+    )
+
+    post.delete()
+    assert _cached_count(INDEX_FEED) == 1, (
+        "Удаление уже скрытой публикации не должно менять счётчик."
+    )
+
+    scheduled = _make_post(
+        mixer, user, published_category,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    assert _cached_count(INDEX_FEED) == 1
+    scheduled.__class__.objects.filter(pk=scheduled.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+    refresh_publication_schedule(
+        {"boundary": timezone.now() - timedelta(minutes=1), "next": None}
+    )
+    assert _cached_count(INDEX_FEED) == 2, (
+        "Убедитесь, что вышедшая отложенная публикация попадает в счётчик."
+    )
+    assert _cached_count(INDEX_FEED) == (
+        get_post_queryset(use_filters=True).count()
+    )
+
+    published_category.is_published = False
+    published_category.save()
+    assert _cached_count(INDEX_FEED) is None, (
+        "Убедитесь, что изменение категории сбрасывает счётчики лент."
+    )
+
+
+@pytest.mark.django_db
+def test_boundary_shift_counted_once(
+        mixer, user, user_client, published_category
+):
+    from django.core.cache import cache
+
+    _make_post(mixer, user, published_category)
+    user_client.get("/")
+    scheduled = _make_post(
+        mixer, user, published_category,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    assert _cached_count(INDEX_FEED) == 1
+    scheduled.__class__.objects.filter(pk=scheduled.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+    # Граница истекла одновременно у нескольких процессов: все они
+    # застали одно и то же состояние.
+    stale = cache.get(PUBLICATION_STATE_KEY)
+    stale["boundary"] -= timedelta(minutes=1)
+    cache.set(PUBLICATION_STATE_KEY, stale, timeout=None)
+    for _ in range(3):
+        refresh_publication_schedule(dict(stale))
+    assert _cached_count(INDEX_FEED) == 2, (
+        "Убедитесь, что вышедшая публикация учитывается в счётчике один"
+        " раз, сколько бы процессов ни сдвигали одну и ту же границу."
+    )
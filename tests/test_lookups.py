@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import lookups
+from blog.lookups import get_lookups
+from blog.models import Category
+
+
+def _lookup_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, [
+        query["sql"]
+        for query in context.captured_queries
+        if 'FROM "blog_category"' in query["sql"]
+        or 'FROM "blog_location"' in query["sql"]
+        or 'JOIN "blog_category"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_feeds_use_cached_lookups(
+        client, published_category, post_with_published_location
+):
+    get_lookups()
+    for url in ("/", f"/category/{published_category.slug}/"):
+        response, queries = _lookup_queries(client, url)
+        assert response.status_code == 200
+        assert not queries, (
+            f"Страница `{url}` должна брать категории и местоположения из "
+            f"справочника в памяти, без запросов и JOIN:\n{queries}"
+        )
+        content = response.content.decode("utf-8")
+        assert published_category.title in content
+        assert post_with_published_location.location.name in content
+
+
+@pytest.mark.django_db
+def test_category_menu_follows_changes(
+        client, published_category, another_category
+):
+    get_lookups()
+    content = client.get("/").content.decode("utf-8")
+    assert f"/category/{another_category.slug}/" in content, (
+        "Убедитесь, что на главной странице есть меню категорий."
+    )
+
+    another_category.is_published = False
+    another_category.save()
+    content = client.get("/").content.decode("utf-8")
+    assert f"/category/{another_category.slug}/" not in content, (
+        "Снятая с публикации категория должна пропадать из меню после "
+        "сохранения."
+    )
+    response = client.get(f"/category/{another_category.slug}/")
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_lookups_expire_without_version_change(
+        monkeypatch, client, published_category, another_category
+):
+    get_lookups()
+    # Смена без сигналов: версию в кеше никто не поменял, как в процессе,
+    # не видящем общего кеша.
+    Category.objects.filter(pk=another_category.pk).update(
+        is_published=False
+    )
+    content = client.get("/").content.decode("utf-8")
+    assert f"/category/{another_category.slug}/" in content
+
+    monkeypatch.setattr(lookups, "LOOKUPS_MAX_AGE", 0)
+    content = client.get("/").content.decode("utf-8")
+    assert f"/category/{another_category.slug}/" not in content, (
+        "Убедитесь, что справочники перечитываются по истечении"
+        " `LOOKUPS_MAX_AGE`, даже если версия не менялась."
+    )
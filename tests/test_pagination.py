@@ -0,0 +1,130 @@
+import base64
+import json
+
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination_walks_feed(
+        user_client, many_posts_with_published_locations
+):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    first_page = user_client.get("/").context["page_obj"]
+    assert [post.id for post in first_page] == [
+        post.id for post in expected[:N_PER_PAGE]
+    ], "Убедитесь, что первая курсорная страница содержит новые публикации."
+    assert first_page.has_next() and not first_page.has_previous()
+
+    second_page = user_client.get(
+        "/", {"cursor": first_page.next_cursor}
+    ).context["page_obj"]
+    assert [post.id for post in second_page] == [
+        post.id for post in expected[N_PER_PAGE:N_PER_PAGE * 2]
+    ]
+    assert second_page.has_previous() and not second_page.has_next()
+
+    back_page = user_client.get(
+        "/", {"cursor": second_page.previous_cursor}
+    ).context["page_obj"]
+    assert [post.id for post in back_page] == [
+        post.id for post in first_page
+    ]
+
+
+@pytest.mark.django_db
+def test_cursor_previous_near_head_returns_full_first_page(
+        many_posts_with_published_locations
+):
+    from blog.models import Post
+    from blog.pagination import CursorPaginator
+
+    paginator = CursorPaginator(Post.objects.all(), N_PER_PAGE)
+    first_page = paginator.get_page(None)
+    boundary = first_page[3]
+    page = paginator.get_page(
+        paginator.encode_cursor(boundary.pub_date, boundary.id, True)
+    )
+    assert [post.id for post in page] == [
+        post.id for post in first_page
+    ], (
+        "Убедитесь, что переход к более новым публикациям у начала ленты"
+        " возвращает полную первую страницу."
+    )
+    assert not page.has_previous()
+
+
+def _token(payload):
+    return base64.urlsafe_b64encode(
+        json.dumps(payload).encode()
+    ).decode().rstrip("=")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("url", "payload"),
+    [
+        ("/?cursor={}", {"d": 1.5, "i": 1, "r": 0}),
+        ("/?cursor={}", {"d": "2020-01-01T00:00:00", "i": 1, "r": 0}),
+        ("/?cursor={}", {"d": "2020-01-01T00:00:00+00:00", "i": 2 ** 70,
+                         "r": 0}),
+        ("/posts/{post}/comments/?cursor={}", {"d": 1.5, "i": 1, "r": 1}),
+        ("/posts/{post}/comments/?cursor={}", {"d": [], "i": 1, "r": 0}),
+        ("/search/?q=x&cursor={}", {"d": "2020-01-01T00:00:00+00:00",
+                                    "i": 1, "r": 0}),
+        ("/search/?q=x&cursor={}", {"d": float("nan"), "i": 1, "r": 0}),
+        ("/search/?q=x&cursor={}", {"d": 1.5, "i": "1", "r": 0}),
+    ],
+)
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_with_mismatched_key_returns_first_page(
+        user_client, post_with_published_location, url, payload
+):
+    url = url.format(_token(payload), post=post_with_published_location.id)
+    response = user_client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что курсор с ключом не того типа на `{url}` приводит"
+        " к первой странице, а не к ошибке."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination_keeps_offset_links(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get("/", {"page": 2})
+    page_obj = response.context["page_obj"]
+    assert page_obj.number == 2, (
+        "Убедитесь, что ссылки вида `?page=N` продолжают работать."
+    )
+
+    broken = user_client.get("/", {"cursor": "not-a-cursor"})
+    assert len(broken.context["page_obj"]) == N_PER_PAGE
+
+
+@pytest.mark.django_db
+def test_page_range_is_elided(rf, many_posts_with_published_locations):
+    from blog.models import Post
+    from blog.selectors import paginate_queryset
+
+    total = len(many_posts_with_published_locations)
+    page_obj = paginate_queryset(
+        Post.objects.order_by("-pub_date"),
+        rf.get("/", {"page": total // 2}),
+        posts_limit=1,
+        use_cursor=False,
+    )
+    pages = page_obj.elided_page_range
+    assert page_obj.ellipsis in pages and len(pages) < total, (
+        "Убедитесь, что пагинатор выводит сокращённый список страниц."
+    )
+    assert pages[0] == 1 and pages[-1] == total
+    assert page_obj.number in pages
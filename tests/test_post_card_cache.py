@@ -0,0 +1,25 @@
+import pytest
+from django.template.loader import render_to_string
+
+
+@pytest.mark.django_db
+def test_post_card_cache_follows_post_changes(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    first = render_to_string("includes/post_card.html", {"post": post})
+
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in render_to_string(
+        "includes/post_card.html", {"post": post}
+    )
+
+    post.category.title = "Новая категория"
+    post.category.save()
+    mixer.blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    rendered = render_to_string("includes/post_card.html", {"post": post})
+    assert "Новая категория" in rendered
+    assert "Комментарии (1)" in rendered
+    assert rendered != first
@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.template.defaultfilters import truncatewords
+from django.test.utils import CaptureQueriesContext
+
+LONG_TEXT = " ".join(f"слово{i}" for i in range(500))
+
+
+def _post_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+        and '"blog_post"."title"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_excerpt_is_maintained_on_save(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        text=LONG_TEXT,
+    )
+    assert post.excerpt == truncatewords(LONG_TEXT, 10)
+
+    post.text = "Короткий текст"
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == "Короткий текст", (
+        "Убедитесь, что `excerpt` обновляется при сохранении публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_feeds_do_not_load_post_text(
+        client, mixer, user, published_category, post_with_published_location
+):
+    post_with_published_location.text = LONG_TEXT
+    post_with_published_location.save()
+    for url in (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+    ):
+        queries = _post_queries(client, url)
+        assert queries and all(
+            '"blog_post"."text"' not in sql for sql in queries
+        ), f"Лента `{url}` не должна загружать полный текст публикаций."
+        assert truncatewords(LONG_TEXT, 10) in client.get(
+            url
+        ).content.decode("utf-8")
+
+    detail_url = f"/posts/{post_with_published_location.id}/"
+    detail = _post_queries(client, detail_url)
+    assert any('"blog_post"."text"' in sql for sql in detail)
@@ -0,0 +1,75 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from PIL import Image
+
+from blog.constants import IMAGE_RENDITION_WIDTHS
+from blog.images import rendition_name
+from blog.models import Post
+from core.models import Job
+from core.tasks import run_pending_jobs
+
+
+@pytest.mark.django_db
+def test_renditions_created_by_worker(
+        post_with_published_location, django_capture_on_commit_callbacks
+):
+    image = post_with_published_location.image
+    assert not Job.objects.exists(), (
+        "Убедитесь, что задачи ставятся в очередь только после фиксации"
+        " транзакции."
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        post_with_published_location.save()
+    run_pending_jobs()
+    stored = Post.objects.get(pk=post_with_published_location.pk)
+    assert stored.image_renditions["name"] == image.name
+    # Оригинал 100×100 уже всех ширин из настроек: остаётся одна копия.
+    assert stored.image_renditions["widths"] == [
+        [IMAGE_RENDITION_WIDTHS[0], 100]
+    ], (
+        "Убедитесь, что для узкого оригинала не создаются одинаковые копии"
+        " и записывается их настоящая ширина."
+    )
+    for width, real_width in stored.image_renditions["widths"]:
+        name = rendition_name(image.name, width)
+        assert image.storage.exists(name), (
+            "Убедитесь, что при сохранении публикации создаются уменьшенные"
+            " копии изображения."
+        )
+        with image.storage.open(name) as rendition:
+            assert Image.open(rendition).width == real_width
+
+
+@pytest.mark.django_db
+def test_original_shown_until_renditions_exist(
+        user_client, post_with_published_location
+):
+    image = post_with_published_location.image
+    content = user_client.get("/").content.decode()
+    assert f'src="{image.url}"' in content and "srcset" not in content, (
+        "Убедитесь, что до обработки изображения выводится оригинал, а"
+        " копии не создаются во время запроса."
+    )
+    assert not image.storage.exists(
+        rendition_name(image.name, IMAGE_RENDITION_WIDTHS[0])
+    )
+
+
+@pytest.mark.django_db
+def test_srcset_rendered_and_backfilled(
+        user_client, post_with_published_location
+):
+    image = post_with_published_location.image
+    missing = rendition_name(image.name, IMAGE_RENDITION_WIDTHS[0])
+
+    call_command("backfill_post_images", stdout=StringIO())
+    assert image.storage.exists(missing)
+
+    content = user_client.get("/").content.decode()
+    assert f"{image.storage.url(missing)} 100w" in content, (
+        "Убедитесь, что в ленте выводится `srcset` с копиями изображения и"
+        " их настоящей шириной."
+    )
+    assert f"{IMAGE_RENDITION_WIDTHS[-1]}w" not in content
@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.selectors import get_post_queryset
+
+CARD_COLUMNS = {
+    "blog_post.id",
+    "blog_post.title",
+    "blog_post.excerpt",
+    "blog_post.pub_date",
+    "blog_post.is_published",
+    "blog_post.image",
+    "blog_post.image_renditions",
+    "blog_post.comment_count",
+    "blog_post.author_id",
+    "blog_post.category_id",
+    "blog_post.location_id",
+}
+AUTHOR_COLUMNS = {"auth_user.id", "auth_user.username"}
+
+
+def _selected_columns(queryset):
+    compiler = queryset.query.get_compiler(using=queryset.db)
+    select, _, _ = compiler.get_select()
+    return {
+        f"{expression.alias}.{expression.target.column}"
+        for expression, _, _ in select
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("projection", "columns"),
+    [
+        ("feed", CARD_COLUMNS | AUTHOR_COLUMNS),
+        (
+            "detail",
+            CARD_COLUMNS
+            | AUTHOR_COLUMNS
+            | {"blog_post.text", "blog_post.view_count"},
+        ),
+        ("profile", CARD_COLUMNS),
+    ],
+)
+def test_projection_columns(projection, columns):
+    queryset = get_post_queryset(
+        use_filters=True, add_annotations=True, projection=projection
+    )
+    assert _selected_columns(queryset) == columns, (
+        f"Проверьте список столбцов профиля выборки `{projection}`: "
+        "лишние столбцы (пароль автора, полный текст) не должны "
+        "загружаться, а категории и местоположения берутся из справочника."
+    )
+
+
+@pytest.mark.django_db
+def test_profile_page_does_not_join_author(
+        client, user, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(f"/profile/{user.username}/")
+    feed_sql = [
+        query["sql"]
+        for query in context.captured_queries
+        if '"blog_post"."excerpt"' in query["sql"]
+    ]
+    assert feed_sql and all('"auth_user"' not in sql for sql in feed_sql), (
+        "Лента профиля не должна присоединять таблицу автора."
+    )
+    assert f"@{user.username}" in response.content.decode("utf-8")
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.publication import visible_as_of
+
+
+@pytest.mark.django_db
+def test_visibility_boundary_is_stable(post_with_published_location):
+    assert visible_as_of() == visible_as_of(), (
+        "Убедитесь, что граница видимости не меняется между запросами."
+    )
+
+
+@pytest.mark.django_db
+def test_scheduled_post_appears_in_cached_feed(
+        mixer, monkeypatch, unlogged_client, user, published_category
+):
+    clock = [timezone.now()]
+    monkeypatch.setattr(timezone, "now", lambda: clock[0])
+    unlogged_client.get("/")
+    scheduled = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        title="Отложенная публикация",
+        pub_date=clock[0] + timedelta(seconds=10),
+    )
+    content = unlogged_client.get("/").content.decode()
+    assert scheduled.title not in content
+
+    clock[0] += timedelta(seconds=11)
+    content = unlogged_client.get("/").content.decode()
+    assert scheduled.title in content, (
+        "Убедитесь, что отложенная публикация появляется в закешированной"
+        " ленте в момент `pub_date`."
+    )
@@ -0,0 +1,126 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+
+from blog.lookups import get_lookups
+from core.middleware import RepeatedQueryError
+
+SESSION_AND_USER = 2
+VALIDATOR = 1
+
+
+@pytest.fixture
+def populated_blog(
+        mixer, many_posts_with_published_locations, another_category
+):
+    posts = many_posts_with_published_locations
+    for post in posts[::2]:
+        post.category = another_category
+        post.save()
+    mixer.cycle(5).blend("blog.Comment", post=posts[0])
+    # Справочники категорий и местоположений читаются один раз на процесс.
+    get_lookups()
+    return posts
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("url", "budget", "counted_feed"),
+    [
+        ("/", SESSION_AND_USER + 2, True),
+        ("/category/{category}/", SESSION_AND_USER + 2, True),
+        ("/profile/{username}/", SESSION_AND_USER + 3, False),
+        ("/posts/{post}/", SESSION_AND_USER + VALIDATOR + 3, False),
+    ],
+    ids=["index", "category", "profile", "post_detail"],
+)
+def test_blog_query_budget(
+        user_client, user, populated_blog, query_budget, url, budget,
+        counted_feed
+):
+    if counted_feed and connection.vendor == "postgresql":
+        # Перед первым COUNT(*) ленты спрашивается оценка планировщика.
+        budget += 1
+    post = populated_blog[0]
+    query_budget(
+        user_client,
+        url.format(
+            category=post.category.slug, username=user.username, post=post.id
+        ),
+        budget,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("url", "budget"),
+    [
+        ("/admin/blog/post/", SESSION_AND_USER + 3),
+        ("/admin/blog/comment/", SESSION_AND_USER + 3),
+    ],
+    ids=["post_changelist", "comment_changelist"],
+)
+def test_admin_query_budget(admin_client, populated_blog, query_budget, url,
+                            budget):
+    if connection.vendor == "postgresql":
+        # Перед COUNT(*) списка спрашивается оценка планировщика.
+        budget += 1
+    query_budget(admin_client, url, budget)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url", ["/admin/blog/post/", "/admin/blog/comment/"],
+    ids=["post_changelist", "comment_changelist"],
+)
+def test_admin_changelist_has_no_repeated_queries(
+        admin_client, populated_blog, url
+):
+    with override_settings(DEBUG=True, QUERY_REPEAT_LIMIT=0):
+        response = admin_client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` не повторяет запросы к базе."
+    )
+
+
+@pytest.mark.django_db
+def test_repeated_queries_fail_in_debug(admin_client, populated_blog):
+    # Список категорий считает строки дважды: с фильтрами и без.
+    with override_settings(DEBUG=True, QUERY_REPEAT_LIMIT=0):
+        with pytest.raises(RepeatedQueryError):
+            admin_client.get("/admin/blog/category/")
+
+
+@pytest.mark.django_db
+def test_post_delete_with_many_comments_in_debug(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(settings.QUERY_REPEAT_LIMIT + 5).blend(
+        "blog.Comment", post=post
+    )
+    with override_settings(DEBUG=True):
+        response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == 302, (
+        "Убедитесь, что удаление публикации с комментариями не повторяет"
+        " запросы для каждого комментария."
+    )
+
+
+@pytest.mark.django_db
+def test_repeated_queries_logged_for_writes(
+        caplog, mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    with override_settings(DEBUG=True, QUERY_REPEAT_LIMIT=0):
+        response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == 302, (
+        "Изменяющий запрос уже записал данные: повторы запросов должны"
+        " попадать в журнал, а не превращаться в ошибку 500."
+    )
+    assert any(
+        record.levelname == "ERROR" and record.name == "core.queries"
+        for record in caplog.records
+    )
@@ -0,0 +1,90 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _main_post_query(client, url: str) -> str:
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    post_queries = [
+        query["sql"]
+        for query in context.captured_queries
+        if re.search(r'FROM "blog_post"', query["sql"])
+        and "ORDER BY" in query["sql"]
+    ]
+    assert post_queries, f"Не найден основной запрос страницы `{url}`."
+    return post_queries[-1]
+
+
+def _query_plan(sql: str) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+
+@pytest.mark.django_db
+def test_feed_queries_use_indexes(
+        user_client, another_user_client, user,
+        many_posts_with_published_locations
+):
+    if connection.vendor != "sqlite":
+        pytest.skip("План запроса проверяется для SQLite.")
+    category = many_posts_with_published_locations[0].category
+    for client, url in (
+        (user_client, "/"),
+        (user_client, f"/category/{category.slug}/"),
+        (user_client, f"/profile/{user.username}/"),
+        (another_user_client, f"/profile/{user.username}/"),
+    ):
+        plan = _query_plan(_main_post_query(client, url))
+        assert re.search(r"blog_post USING (COVERING )?INDEX", plan), (
+            f"Убедитесь, что основной запрос страницы `{url}` использует"
+            f" индекс таблицы публикаций:\n{plan}"
+        )
+        assert "TEMP B-TREE FOR ORDER BY" not in plan, (
+            f"Убедитесь, что основной запрос страницы `{url}` не сортирует"
+            f" публикации во временной таблице:\n{plan}"
+        )
+
+
+def test_post_has_no_overlapping_pub_date_indexes():
+    from blog.models import Post
+
+    leading = {
+        post_index.name
+        for post_index in Post._meta.indexes
+        if post_index.fields[0].lstrip("-") in ("pub_date", "is_published")
+    }
+    assert leading == {"post_published_pub_date_idx", "post_pub_date_idx"}, (
+        "Убедитесь, что по `pub_date` без другого префикса у публикаций"
+        " два индекса: частичный для лент и полный для админки."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("query", "index"),
+    [
+        ("", "post_pub_date_idx"),
+        ("?is_published__exact=1", "post_published_pub_date_idx"),
+        ("?is_published__exact=0", "post_pub_date_idx"),
+        ("?pub_date__year=2025", "post_pub_date_idx"),
+    ],
+    ids=["all", "published", "drafts", "year"],
+)
+def test_admin_post_changelist_uses_pub_date_indexes(
+        admin_client, many_posts_with_published_locations, query, index
+):
+    if connection.vendor != "sqlite":
+        pytest.skip("План запроса проверяется для SQLite.")
+    plan = _query_plan(
+        _main_post_query(admin_client, f"/admin/blog/post/{query}")
+    )
+    assert re.search(rf"blog_post USING (COVERING )?INDEX {index}\b", plan), (
+        f"Убедитесь, что список публикаций в админке `{query}` использует"
+        f" индекс `{index}`:\n{plan}"
+    )
+    assert "TEMP B-TREE FOR ORDER BY" not in plan
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post, PostRanking
+from blog.ranking import log_score, update_rankings
+from blog.selectors import get_ranked_posts
+
+DAY = 60 * 60 * 24
+
+
+def test_log_score_decays_older_engagement():
+    now = timezone.now()
+    fresh = log_score(None, 10, now, DAY)
+    old = log_score(None, 10, now - timedelta(days=1), DAY)
+    assert fresh - old == pytest.approx(1), (
+        "Вклад должен затухать вдвое за период полураспада."
+    )
+    assert log_score(old, 10, now - timedelta(days=1), DAY) == (
+        pytest.approx(old + 1)
+    )
+
+
+@pytest.fixture
+def ranked_posts(mixer, user, published_category):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            is_published=True,
+            pub_date=now - timedelta(days=days),
+            view_count=views,
+        )
+        for days, views in ((1, 10), (2, 30), (3, 20), (4, 0))
+    ]
+
+
+@pytest.mark.django_db
+def test_update_rankings_is_incremental(ranked_posts):
+    assert update_rankings() == 3, (
+        "Публикации без просмотров и комментариев не попадают в рейтинг."
+    )
+    assert update_rankings() == 0, (
+        "Повторный пересчёт без новых просмотров ничего не должен менять."
+    )
+
+    Post.objects.filter(pk=ranked_posts[2].pk).update(view_count=1000)
+    assert update_rankings() == 1
+    ranking = PostRanking.objects.get(post=ranked_posts[2])
+    assert ranking.views_seen == 1000
+
+
+@pytest.mark.django_db
+def test_popular_and_trending_feeds(client, ranked_posts):
+    update_rankings()
+    popular = [post.pk for post in get_ranked_posts("popular")]
+    assert popular == [
+        ranked_posts[1].pk, ranked_posts[2].pk, ranked_posts[0].pk
+    ]
+
+    # Свежая волна комментариев поднимает публикацию в «Обсуждают сейчас».
+    Post.objects.filter(pk=ranked_posts[2].pk).update(comment_count=10)
+    update_rankings()
+    assert get_ranked_posts("trending")[0].pk == ranked_posts[2].pk
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get("/trending/")
+    assert response.status_code == 200
+    assert [post.pk for post in response.context["posts"]][0] == (
+        ranked_posts[2].pk
+    )
+    feed_sql = [
+        query["sql"]
+        for query in context.captured_queries
+        if "blog_postranking" in query["sql"]
+    ]
+    assert len(feed_sql) == 1 and "LIMIT" in feed_sql[0], (
+        "Лента рейтинга должна читать первые N строк таблицы рейтинга "
+        "одним запросом."
+    )
+
+    hidden = ranked_posts[1]
+    hidden.is_published = False
+    hidden.save()
+    assert hidden.pk not in [
+        post.pk for post in client.get("/popular/").context["posts"]
+    ], "Снятые с публикации записи не должны попадать в ленты рейтинга."
+
+
+@pytest.mark.django_db
+def test_deleted_post_leaves_cached_ranked_feeds(client, ranked_posts):
+    update_rankings()
+    link = f"/posts/{ranked_posts[1].pk}/"
+    for url in ("/popular/", "/trending/"):
+        assert link in client.get(url).content.decode()
+    ranked_posts[1].delete()
+    for url in ("/popular/", "/trending/"):
+        assert link not in (
+            client.get(url).content.decode()
+        ), (
+            f"Убедитесь, что удалённая публикация пропадает из"
+            f" закешированной ленты `{url}`."
+        )
@@ -0,0 +1,87 @@
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from blog.lookups import get_lookups
+from blog.models import Post
+
+DATABASES = ["default", "replica"]
+
+
+@pytest.fixture
+def replica_settings(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.REPLICA_PIN_SECONDS = 10
+    return settings
+
+
+def _aliases_read(client, url):
+    contexts = {
+        alias: CaptureQueriesContext(connections[alias])
+        for alias in DATABASES
+    }
+    for context in contexts.values():
+        context.__enter__()
+    try:
+        response = client.get(url)
+    finally:
+        for context in contexts.values():
+            context.__exit__(None, None, None)
+    assert response.status_code in (200, 404)
+    return {
+        alias: len(context.captured_queries)
+        for alias, context in contexts.items()
+    }
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_read_only_views_use_replica(
+        replica_settings, unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    # Справочники читаются из основной базы один раз на процесс.
+    get_lookups()
+    queries = _aliases_read(unlogged_client, "/")
+    assert queries["replica"] and not queries["default"], (
+        "Убедитесь, что главная страница читает данные из реплики."
+    )
+    response = unlogged_client.get(f"/posts/{post.id}/")
+    assert response.status_code == 404, (
+        "Публикация есть только в основной базе: страница из реплики "
+        "не должна её находить."
+    )
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_writes_go_to_primary_and_pin_reads(
+        replica_settings, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Комментарий"}
+    )
+    assert response.status_code == 302
+    assert post.comments.using("default").count() == 1
+    assert not Post.objects.using("replica").exists(), (
+        "Убедитесь, что запись идёт только в основную базу."
+    )
+
+    queries = _aliases_read(user_client, f"/posts/{post.id}/")
+    assert queries["default"] and not queries["replica"], (
+        "Убедитесь, что после изменения пользователь читает из основной "
+        "базы в течение `REPLICA_PIN_SECONDS`."
+    )
+
+    user_client.cookies["db_pin"] = "0"
+    queries = _aliases_read(user_client, f"/posts/{post.id}/")
+    assert queries["replica"], (
+        "Убедитесь, что по истечении окна чтение возвращается в реплику."
+    )
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_write_views_read_from_primary(replica_settings, user_client):
+    queries = _aliases_read(user_client, "/posts/create/")
+    assert not queries["replica"], (
+        "Убедитесь, что страницы изменения данных читают из основной базы."
+    )
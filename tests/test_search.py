@@ -0,0 +1,91 @@
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category, published_location):
+    def make(title, text, **kwargs):
+        params = dict(
+            title=title,
+            text=text,
+            author=user,
+            category=published_category,
+            location=published_location,
+            is_published=True,
+            pub_date=timezone.now() - timezone.timedelta(days=1),
+        )
+        params.update(kwargs)
+        return mixer.blend("blog.Post", **params)
+
+    return make
+
+
+@pytest.mark.django_db
+def test_search_finds_visible_posts_ranked(
+        searchable_posts, unlogged_client
+):
+    in_text = searchable_posts("Прогулка", "Видели <b>северное</b> сияние.")
+    in_title = searchable_posts("Северное сияние", "Фото с Кольского.")
+    searchable_posts("Скрытое", "Северное сияние", is_published=False)
+    searchable_posts(
+        "Будущее",
+        "Северное сияние",
+        pub_date=timezone.now() + timezone.timedelta(days=1),
+    )
+    searchable_posts("Другое", "Про погоду.")
+
+    response = unlogged_client.get("/search/", {"q": "северн сиян"})
+    assert response.status_code == 200
+    found = list(response.context["page_obj"])
+    assert [post.id for post in found] == [in_title.id, in_text.id], (
+        "Убедитесь, что поиск находит только видимые публикации, а совпадения"
+        " в заголовке ранжируются выше."
+    )
+    content = response.content.decode()
+    assert "<mark>северное</mark>" in content, (
+        "Убедитесь, что совпадения во фрагменте текста выделяются."
+    )
+    assert "<b>" not in content.split("<mark>")[1].split("</p>")[0], (
+        "Убедитесь, что фрагмент текста экранируется."
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_edits(searchable_posts, unlogged_client):
+    post = searchable_posts("Черновик", "Старый текст.")
+    post.text = "Новый текст про маяк."
+    post.save()
+    response = unlogged_client.get("/search/", {"q": "маяк"})
+    assert list(response.context["page_obj"]) == [post]
+
+    Post.objects.filter(pk=post.pk).delete()
+    response = unlogged_client.get("/search/", {"q": "маяк"})
+    assert not list(response.context["page_obj"]), (
+        "Убедитесь, что удалённая публикация исчезает из поиска."
+    )
+
+
+@pytest.mark.django_db
+def test_search_cursor_pagination(searchable_posts, unlogged_client):
+    posts = [searchable_posts(f"Маяк {i}", "Маяк на берегу.") for i in range(15)]
+    first = unlogged_client.get("/search/", {"q": "маяк"}).context["page_obj"]
+    assert first.has_next()
+    second = unlogged_client.get(
+        "/search/", {"q": "маяк", "cursor": first.next_cursor}
+    ).context["page_obj"]
+    seen = [post.id for post in first] + [post.id for post in second]
+    assert sorted(seen) == sorted(post.id for post in posts), (
+        "Убедитесь, что курсорная пагинация поиска обходит все результаты"
+        " без повторов."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ['"', "AND OR NOT", "*", "  "])
+def test_search_survives_operator_input(query, unlogged_client):
+    response = unlogged_client.get("/search/", {"q": query})
+    assert response.status_code == 200, (
+        "Убедитесь, что служебные символы в запросе не ломают поиск."
+    )
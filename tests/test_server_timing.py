@@ -0,0 +1,31 @@
+import re
+
+import pytest
+from django.test import override_settings
+
+
+@pytest.mark.django_db
+def test_server_timing_header(user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    with override_settings(SERVER_TIMING_SAMPLE_RATE=1.0):
+        response = user_client.get(url)
+    header = response.get("Server-Timing", "")
+    for metric in ("db", "tpl", "view", "total"):
+        assert re.search(rf"\b{metric};dur=\d+\.\d", header), (
+            f"Убедитесь, что заголовок `Server-Timing` содержит `{metric}`."
+        )
+    queries = int(re.search(r'desc="(\d+) queries"', header).group(1))
+    assert queries > 0
+
+    with override_settings(SERVER_TIMING_SAMPLE_RATE=0):
+        response = user_client.get("/")
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+def test_server_timing_disabled_by_default(client):
+    response = client.get("/")
+    assert "Server-Timing" not in response, (
+        "Убедитесь, что по умолчанию заголовок `Server-Timing` не"
+        " отдаётся."
+    )
@@ -0,0 +1,18 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db
+def test_sqlite_connection_pragmas(settings):
+    if connection.vendor != "sqlite":
+        pytest.skip("PRAGMA применяются только к SQLite.")
+    with connection.cursor() as cursor:
+        for name in ("synchronous", "busy_timeout", "cache_size"):
+            cursor.execute(f"PRAGMA {name}")
+            expected = settings.SQLITE_PRAGMAS[name]
+            if name == "synchronous":
+                expected = 1  # NORMAL
+            assert cursor.fetchone()[0] == expected, (
+                f"Убедитесь, что при подключении к SQLite выполняется "
+                f"`PRAGMA {name}` из настройки `SQLITE_PRAGMAS`."
+            )
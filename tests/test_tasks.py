@@ -0,0 +1,126 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import Job
+from core.tasks import (
+    claim_jobs,
+    enqueue,
+    purge_finished_jobs,
+    run_pending_jobs,
+    task,
+    task_metrics,
+)
+
+calls = []
+
+
+@task(name="tests.flaky", max_attempts=2)
+def flaky(value: int) -> None:
+    calls.append(value)
+    if value < 0:
+        raise ValueError("Отрицательное значение")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+    Job.objects.all().delete()
+
+
+@pytest.mark.django_db
+def test_enqueue_runs_once_and_dedupes():
+    assert enqueue("tests.flaky", value=1) is not None
+    assert enqueue(flaky, value=1) is None, (
+        "Одинаковая задача не должна дублироваться в очереди."
+    )
+
+    assert run_pending_jobs() == 1
+    assert calls == [1]
+    assert Job.objects.get().status == Job.Status.DONE
+
+
+@pytest.mark.django_db
+def test_failed_job_is_retried_then_failed():
+    job = flaky.enqueue(value=-1)
+
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert job.status == Job.Status.QUEUED and job.attempts == 1
+    assert "ValueError" in job.last_error
+
+    Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED and job.attempts == 2
+
+
+@pytest.mark.django_db
+def test_expired_claim_becomes_visible_again():
+    job = flaky.enqueue(value=2)
+    assert [claimed.pk for claimed in claim_jobs(1)] == [job.pk]
+    assert claim_jobs(1) == []
+
+    Job.objects.filter(pk=job.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1)
+    )
+    assert [claimed.pk for claimed in claim_jobs(1)] == [job.pk]
+
+
+@pytest.mark.django_db
+def test_expired_last_attempt_of_periodic_task_is_rescheduled():
+    job = purge_finished_jobs.enqueue()
+    assert [claimed.pk for claimed in claim_jobs(1)] == [job.pk]
+    # Обработчик умер во время последней попытки.
+    Job.objects.filter(pk=job.pk).update(
+        attempts=F("max_attempts"),
+        locked_until=timezone.now() - timedelta(seconds=1),
+    )
+    assert claim_jobs(1) == []
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED
+    queued = Job.objects.filter(
+        name=purge_finished_jobs.name, status=Job.Status.QUEUED
+    )
+    assert queued.count() == 1, (
+        "Убедитесь, что периодическая задача, не уложившаяся во время на"
+        " последней попытке, снова ставится в очередь."
+    )
+    assert queued.get().run_after > timezone.now()
+
+
+@pytest.mark.django_db
+def test_runworker_once_inline():
+    flaky.enqueue(value=3)
+    call_command("runworker", processes=0, once=True)
+    assert calls == [3]
+
+    out = StringIO()
+    call_command("runworker", stats=True, stdout=out)
+    assert '"succeeded": 1' in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_metrics_counted_from_jobs_and_done_jobs_purged():
+    flaky.enqueue(value=4)
+    failing = flaky.enqueue(value=-4)
+    run_pending_jobs()
+    Job.objects.filter(pk=failing.pk).update(run_after=timezone.now())
+    run_pending_jobs()
+
+    metrics = task_metrics()["tasks"]["tests.flaky"]
+    assert (metrics["succeeded"], metrics["retried"], metrics["failed"]) == (
+        1, 1, 1
+    ), "Убедитесь, что метрики задач считаются по таблице задач."
+
+    Job.objects.filter(status=Job.Status.DONE).update(
+        finished_at=timezone.now() - timedelta(days=30)
+    )
+    assert purge_finished_jobs() == 1
+    assert list(Job.objects.values_list("status", flat=True)) == [
+        Job.Status.FAILED
+    ], "Убедитесь, что удаляются только старые выполненные задачи."
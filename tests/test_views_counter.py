@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import views_counter
+from blog.models import PostViewBatch
+from blog.selectors import get_post_views
+from blog.tasks import flush_post_views
+from core.models import Job
+from core.tasks import run_pending_jobs, schedule_periodic_tasks
+
+
+@pytest.mark.django_db
+def test_post_detail_does_not_write_views(
+        client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    assert not [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("UPDATE")
+    ], "Просмотр публикации не должен выполнять UPDATE в запросе."
+    assert get_post_views(post_with_published_location) == 1
+
+
+@pytest.mark.django_db
+def test_not_modified_visit_is_counted(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    another_user_client.get(url)
+    etag = another_user_client.get(url)["ETag"]
+    response = another_user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert get_post_views(post) == 3, (
+        "Убедитесь, что повторный визит с ответом 304 тоже учитывается"
+        " как просмотр."
+    )
+
+    views_counter.spill_views()
+    views_counter.flush_views()
+    response = another_user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после записи просмотров ETag страницы меняется и"
+        " браузер получает новый счётчик."
+    )
+
+
+@pytest.mark.django_db
+def test_views_are_flushed_in_one_update(
+        mixer, user, published_category
+):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    for post in posts:
+        for _ in range(post.pk % 3 + 1):
+            views_counter.record_view(post.pk)
+    views_counter.spill_views()
+    views_counter.record_view(posts[0].pk)
+    views_counter.spill_views()
+
+    with CaptureQueriesContext(connection) as context:
+        assert views_counter.flush_views() == sum(
+            post.pk % 3 + 1 for post in posts
+        ) + 1
+    updates = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 1, (
+        "Убедитесь, что накопленные просмотры записываются одним UPDATE."
+    )
+    assert not PostViewBatch.objects.exists()
+    for post in posts:
+        post.refresh_from_db()
+        expected = post.pk % 3 + 1 + (post.pk == posts[0].pk)
+        assert post.view_count == expected
+
+    assert views_counter.flush_views() == 0, (
+        "Повторный сброс не должен учитывать просмотры второй раз."
+    )
+
+
+@pytest.mark.django_db
+def test_batches_of_other_processes_are_counted(
+        post_with_published_location
+):
+    post = post_with_published_location
+    # Пачки, записанные другими веб-процессами.
+    PostViewBatch.objects.bulk_create(
+        [PostViewBatch(post_id=post.pk, views=views) for views in (2, 3)]
+    )
+    views_counter.record_view(post.pk)
+    assert get_post_views(post) == 6, (
+        "Убедитесь, что к счётчику просмотров добавляются пачки всех"
+        " процессов, ещё не записанные в публикацию."
+    )
+    assert views_counter.flush_views() == 5
+    post.refresh_from_db()
+    assert post.view_count == 5, (
+        "Убедитесь, что фоновая задача записывает пачки всех процессов."
+    )
+    assert get_post_views(post) == 6
+
+
+@pytest.mark.django_db
+def test_flush_task_is_periodic(post_with_published_location):
+    Job.objects.all().delete()
+    assert schedule_periodic_tasks() >= 1
+    views_counter.record_view(post_with_published_location.pk)
+    views_counter.spill_views()
+
+    run_pending_jobs()
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.view_count == 1
+    assert Job.objects.filter(
+        name=flush_post_views.name, status=Job.Status.QUEUED
+    ).exists(), "Периодическая задача должна ставить следующий запуск."